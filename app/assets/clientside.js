@@ -0,0 +1,59 @@
+// clientside callbacks: pure reshaping of inputs (pathnames, passthroughs, formatting) runs in the browser,
+// no server round trip or worker thread involved. Dash loads every file in assets/ before the callbacks run.
+// Python side: clientside_callback(ClientsideFunction("navigation", "player"), Output(...), ...)
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+
+    // helpers shared by the callbacks below, also usable from inline clientside callbacks
+    paths: {
+        // "players", 123 -> "/players/123", no_update while nothing is selected
+        entity: function (section, value) {
+            if (value === null || value === undefined || value === "" || (Array.isArray(value) && !value.length)) {
+                return window.dash_clientside.no_update;
+            }
+            return "/" + section + "/" + encodeURIComponent(value);
+        },
+    },
+
+    // single-value versions of utils/formatting (same output), keep the two in step
+    format: {
+        // 754 -> "12:34"
+        minutes: function (seconds) {
+            seconds = Math.trunc(seconds || 0);
+            return Math.floor(seconds / 60) + ":" + String(seconds % 60).padStart(2, "0");
+        },
+
+        // 0.4567 -> "45.7%", missing rates stay missing
+        pct: function (rate, decimals) {
+            if (rate === null || rate === undefined || Number.isNaN(rate)) {
+                return null;
+            }
+            return (100 * rate).toFixed(decimals === undefined ? 1 : decimals) + "%";
+        },
+
+        // 5, 0.25 -> "5 (25.0%)"
+        countPct: function (count, rate, decimals) {
+            return count + " (" + window.dash_clientside.format.pct(rate, decimals) + ")";
+        },
+    },
+
+    // (n_clicks, value) -> pathname of the selected player / team / game
+    navigation: {
+        player: function (n_clicks, value) {
+            return window.dash_clientside.paths.entity("players", value);
+        },
+        team: function (n_clicks, value) {
+            return window.dash_clientside.paths.entity("teams", value);
+        },
+        game: function (n_clicks, value) {
+            return window.dash_clientside.paths.entity("game", value);
+        },
+    },
+
+    tables: {
+        // a store's records straight into a DataTable
+        records: function (data) {
+            return data || [];
+        },
+    },
+});
@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+
+# production server: gunicorn -c gunicorn.conf.py main:server
+#
+# preload_app imports pandas/plotly/networkx and registers the Dash pages once in the master, the forked
+# workers share those pages copy-on-write. Because the code is loaded before fork, `kill -HUP <master>`
+# only restarts the workers gracefully; to pick up new code do a zero-downtime binary upgrade instead:
+# `kill -USR2 <master>`, then `kill -WINCH <old master>` and `kill -QUIT <old master>` once the new one is up.
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:80")
+
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# callbacks spend most of their time waiting on euroleague-api, threads keep the cores busy meanwhile
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+
+preload_app = True
+reload = False
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# recycle workers now and then to cap slow memory growth, jittered so they don't restart together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # build the per-process static data in the master so every worker inherits it
+    from utils import court
+
+    court.court_figure()
+
+
+def post_fork(server, worker):
+    # background threads do not survive the fork, every worker schedules its own jobs
+    from utils import loaders, warmer
+
+    loaders.track_finished_games()
+    warmer.start()
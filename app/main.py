@@ -1,12 +1,30 @@
+import os
+
 import dash
 import dash_bootstrap_components as dbc
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
-import pandas as pd
+from dash import Dash, html
+from flask import jsonify
+
+from utils import admin, api, images, loaders, warmer
 
 
 app = Dash(__name__, use_pages=True, external_stylesheets=[dbc.themes.LUX])
 
 server = app.server
+images.register_routes(server)
+
+
+@admin.route(server, "/_stats/api")
+def api_latency_stats():
+    return jsonify(api.latency_stats())
+
+
+@admin.route(server, "/_cache/game/<int:game_code>", methods=["DELETE"])
+def invalidate_game(game_code):
+    # e.g. after a stat correction upstream: the next visit (on any worker) refetches and re-renders the game
+    loaders.invalidate_game(game_code)
+    return jsonify(invalidated=game_code)
+
 
 navigation_bar = html.Div(
     dbc.NavbarSimple([
@@ -32,5 +50,8 @@ app.layout = html.Div([
 
 
 if __name__ == "__main__":
+    # development server only, production runs through gunicorn (see gunicorn.conf.py)
+    loaders.track_finished_games()
+    warmer.start()
     context = ('local.crt', 'local.key')
-    app.run(host="0.0.0.0", port=80, debug=True, ssl_context=context)
+    app.run(host="0.0.0.0", port=80, debug=os.environ.get("DASH_DEBUG") == "1", ssl_context=context)
@@ -1,30 +1,30 @@
+import logging
+
 import dash
 import numpy as np
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
-import plotly.express as px
-import pandas as pd
-import requests
-import igviz as ig
-import networkx as nx
-import plotly.graph_objects as go
+from dash import html, dcc, dash_table, callback, clientside_callback, ClientsideFunction, set_props, Output, Input, State
+from dash.exceptions import PreventUpdate
+from plotly.colors import sequential
+from utils import api, assist_network, background, formatting, images, key_stats, loaders, output_cache, paging, reference, shots, store, table_specs, warmer
 
 dash.register_page(__name__, path_template="/game/<game_code>")
-features = pd.read_csv("assets/features.csv")
+
+logger = logging.getLogger(__name__)
+
+BOX_SCORE_COLUMNS = ("Name", "MIN", "pts", "USG", "2FG", "3FG", "FT", "DREB", "OREB", "TREB", "AS", "TO", "ST", "FV",
+                     "PF", "RV", "PIR", "PER")
+# page_current, page_size, sort_by, filter_query of a freshly rendered box score table
+BOX_SCORE_INITIAL_STATE = (0, paging.PAGE_SIZE, [], "")
+# shown in place of a section that failed to render, the other sections still come through
+UNAVAILABLE = [html.P("This section is not available right now.")]
 
 
 def layout(game_code=1):
-    init_team = requests.get(f"http://euroleague-api:8989/SeasonTeams")
-    init_team = init_team.json()
+    init_team = api.get("SeasonTeams")
     init_team = {x["CODETEAM"]: x["team_name"] for x in init_team}
 
     game_id_store = dcc.Store(id="game-code-store", data=game_code)
-    json_store = dcc.Store(id="json-store", data={})
-    json_store_team = dcc.Store(id="json-store-teams", data={})
-    json_store_points = dcc.Store(id="json-store-points", data={})
-    json_store_assists = dcc.Store(id="json-store-assists", data={})
-    key_stats_table_store = dcc.Store(id="key-stats-table-store", data={})
-    key_stats_json = dcc.Store(id="key-stats-json", data=[])
-    court_figure_df = dcc.Store(id="court-figure-store", data=features.to_json(orient="split"))
+    json_store_game = dcc.Store(id="json-store-game", data={})
     json_store_init_team = dcc.Store(id="json-store-init-team-game", data=init_team)
 
     layout_local = html.Div(
@@ -42,13 +42,7 @@ def layout(game_code=1):
             ,
             dcc.Location(id="location-game"),
             game_id_store,
-            json_store,
-            json_store_team,
-            json_store_points,
-            json_store_assists,
-            key_stats_table_store,
-            key_stats_json,
-            court_figure_df,
+            json_store_game,
             json_store_init_team,
             html.Div(id="score-title",
                      style={"display": "flex",
@@ -65,7 +59,10 @@ def layout(game_code=1):
                             "align-items": "center"})
 
             ,
-            html.Div(id="box-score", children=[], className="box-score-wrapper"),
+            html.Div(id="box-score", children=[box_score_table("box-score-table-home"),
+                                               html.Div(style={"width": "5%"}),
+                                               box_score_table("box-score-table-away")],
+                     className="box-score-wrapper"),
             html.Div(id="assist-charts", children=[], style={
                 "display": "flex",
                 "align-items": "flex-start",
@@ -82,22 +79,60 @@ def layout(game_code=1):
 
 
 @callback(
-    Output(component_id="json-store", component_property="data"),
-    Input(component_id="game-code-store", component_property="data")
-)
-def call_players_api(game_code):
-    response = requests.get(f"http://euroleague-api:8989/GamePlayers?game_code={game_code}")
-    response = response.json()
-    return response
-
-
-@callback(
-    Output(component_id="score-title", component_property="children"),
-    Input(component_id="json-store", component_property="data"),
-    Input(component_id="json-store-init-team-game", component_property="data")
+    Output(component_id="json-store-game", component_property="data"),
+    Input(component_id="game-code-store", component_property="data"),
+    State(component_id="json-store-init-team-game", component_property="data"),
+    background=background.MANAGER is not None,
+    manager=background.MANAGER
 )
-def plot_game_points(response, team_dict):
-    df = pd.DataFrame.from_dict(response)
+def render_game(game_code, team_dict):
+    # one request renders the whole page from the cached game bundle; every section is pushed with
+    # set_props as soon as it is built. They only stream in one by one as a background callback, which is
+    # opt-in (EUROLEAGUE_BACKGROUND_DIR), otherwise they all arrive with the response
+    return render_sections(game_code, team_dict, set_props)
+
+
+def prerender_game(game_code):
+    # warms the output cache outside of a request
+    init_team = {x["CODETEAM"]: x["team_name"] for x in api.get("SeasonTeams")}
+    render_sections(game_code, init_team, lambda component_id, props: None)
+
+
+def render_sections(game_code, team_dict, publish):
+    # rendered sections come from the output cache, the bundle is only loaded when one is missing
+    loaders.sync_game(game_code)
+    sections = output_cache.get_game(game_code)
+    if len(sections) == len(output_cache.GAME_SECTIONS):
+        bundle = loaders.game_bundle_keys(game_code)
+    else:
+        bundle = loaders.load_game_bundle(game_code)
+
+    def section(name, build, placeholder=UNAVAILABLE):
+        # a failing section is logged and left out of the output cache, the page shows the placeholder instead
+        if name not in sections:
+            try:
+                sections[name] = output_cache.put(game_code, name, build())
+            except Exception:
+                logger.exception("could not render %s of game %s", name, game_code)
+                return placeholder
+        return sections[name]
+
+    publish("score-title", {"children": section("score-title", lambda: score_title(bundle, team_dict))})
+    publish("key-stats", {"children": section("key-stats", lambda: shot_charts(bundle, game_code))})
+
+    data_home, pages_home, data_away, pages_away = section(
+        "box-score", lambda: box_score_pages(bundle, *BOX_SCORE_INITIAL_STATE * 2), placeholder=([], 1, [], 1))
+    publish("box-score-table-home", {"data": data_home, "page_count": pages_home})
+    publish("box-score-table-away", {"data": data_away, "page_count": pages_away})
+
+    publish("assist-charts", {"children": section("assist-charts", lambda: assist_charts(bundle, game_code))})
+
+    # only the store keys go to the browser, the frames stay on the server
+    return bundle
+
+
+def score_title(bundle, team_dict):
+    df = store.frame(bundle["players"])
     df = df.groupby(["CODETEAM", "home"]).agg({"pts": "sum"}).reset_index()
     home_score = df.loc[df["home"], "pts"].iloc[0]
     away_score = df.loc[~df["home"], "pts"].iloc[0]
@@ -129,10 +164,10 @@ def plot_game_points(response, team_dict):
     )
 
     score_card = html.Div(children=[
-        html.Img(src=dash.get_asset_url(home_img_url), style={"width": "25%"}),
+        images.responsive_image(home_img_url, sizes="(max-width: 700px) 10vw, 7vw", style={"width": "25%"}),
         html.Div(f"{home_score} - {away_score}", className="score-title"
                 ),
-        html.Img(src=dash.get_asset_url(away_img_url), style={"width": "25%"})
+        images.responsive_image(away_img_url, sizes="(max-width: 700px) 10vw, 7vw", style={"width": "25%"})
 
     ],
         style={"display": "flex",
@@ -147,202 +182,14 @@ def plot_game_points(response, team_dict):
             right_team]
 
 
-@callback(
-    Output(component_id="json-store-teams", component_property="data"),
-    Input(component_id="game-code-store", component_property="data")
-)
-def call_game_lite_api(game_code):
-    response = requests.get(f"http://euroleague-api:8989/GameLite?game_code={game_code}")
-    response = response.json()
-    return response
-
-
-@callback(
-    Output(component_id="key-stats-json", component_property="data"),
-    Input(component_id="json-store-teams", component_property="data")
-)
-def update_key_stats_df(response):
-    df = pd.DataFrame.from_dict(response)
-
-    mid_col = ["2P%", "3P%", "FT%", "DREB%", "OREB%", "AS", "TO", "ST", "BL", "POS", "ORtg"]
-    df["home"] = df["home"].astype(bool)
-
-    l_u_1 = f"{df.loc[df['home'], '2FGM'].iloc[0]} / {df.loc[df['home'], '2FGA'].iloc[0]} ({100 * df.loc[df['home'], '2FGR'].iloc[0]:.2f}%)"
-    l_u_2 = f"{df.loc[df['home'], '3FGM'].iloc[0]} / {df.loc[df['home'], '3FGA'].iloc[0]} ({100 * df.loc[df['home'], '3FGR'].iloc[0]:.2f}%)"
-    l_u_3 = f"{df.loc[df['home'], 'FTM'].iloc[0]} / {df.loc[df['home'], 'FTA'].iloc[0]} ({100 * df.loc[df['home'], 'FTR'].iloc[0]:.2f}%)"
-    l_u_4 = f"{df.loc[df['home'], 'D'].iloc[0]}  ({100 * df.loc[df['home'], 'DRBEBR'].iloc[0]:.2f}%)"
-    l_u_5 = f"{df.loc[df['home'], 'O'].iloc[0]}  ({100 * df.loc[df['home'], 'ORBEBR'].iloc[0]:.2f}%)"
-    l_rest = [f"{df.loc[df['home'], x].iloc[0]}" for x in ["AS", "TO", "ST", "FV", "pos"]]
-    l_l_1 = f"{100 * df.loc[df['home'], 'PPP'].iloc[0]:.2f}"
-
-    r_u_1 = f"{df.loc[~df['home'], '2FGM'].iloc[0]} / {df.loc[~df['home'], '2FGA'].iloc[0]} ({100 * df.loc[~df['home'], '2FGR'].iloc[0]:.2f}%)"
-    r_u_2 = f"{df.loc[~df['home'], '3FGM'].iloc[0]} / {df.loc[~df['home'], '3FGA'].iloc[0]} ({100 * df.loc[~df['home'], '3FGR'].iloc[0]:.2f}%)"
-    r_u_3 = f"{df.loc[~df['home'], 'FTM'].iloc[0]} / {df.loc[~df['home'], 'FTA'].iloc[0]} ({100 * df.loc[~df['home'], 'FTR'].iloc[0]:.2f}%)"
-    r_u_4 = f"{df.loc[~df['home'], 'D'].iloc[0]}  ({100 * df.loc[~df['home'], 'DRBEBR'].iloc[0]:.2f}%)"
-    r_u_5 = f"{df.loc[~df['home'], 'O'].iloc[0]}  ({100 * df.loc[~df['home'], 'ORBEBR'].iloc[0]:.2f}%)"
-    r_rest = [f"{df.loc[~df['home'], x].iloc[0]}" for x in ["AS", "TO", "ST", "FV", "pos"]]
-    r_l_1 = f"{100 * df.loc[~df['home'], 'PPP'].iloc[0]:.2f}"
-
-    left_col = [l_u_1, l_u_2, l_u_3, l_u_4, l_u_5, *l_rest, l_l_1]
-    right_col = [r_u_1, r_u_2, r_u_3, r_u_4, r_u_5, *r_rest, r_l_1]
-
-    df_return = pd.DataFrame.from_dict({
-        "left_col": left_col,
-        "mid_col": mid_col,
-        "right_col": right_col})
-
-    return df_return.to_json(orient="split")
-
-
-@callback(Output('key-stats-table-store', 'data'),
-          Input('key-stats-json', 'data'))
-def update_key_stats_output(json_df):
-    info_dataframe = pd.read_json(json_df, orient='split')
-
-    data = info_dataframe.to_dict("records")
-    cols = [{"name": i, "id": i} for i in info_dataframe.columns]
-
-    child = dash_table.DataTable(
-        id='key-stats-table',
-        data=data,
-        columns=cols,
-        style_as_list_view=True,
-        style_data_conditional=[
-            {"if": {"column_id": "left_col"},
-             "textAlign": "right"},
-            {"if": {"column_id": "mid_col"},
-             "textAlign": "center",
-             "font-weight": "bold"},
-            {"if": {"column_id": "right_col"},
-             "textAlign": "left"}
-        ],
-        style_header={"display": "none"},
-        fill_width=False
-
-    )
-
-    return child
-
-
-@callback(
-    Output(component_id="json-store-points", component_property="data"),
-    Input(component_id="game-code-store", component_property="data")
-)
-def call_points_single_game_api(game_code):
-    response = requests.get(f"http://euroleague-api:8989/PointsSingleGame?game_code={game_code}")
-    response = response.json()
-    return response
-
-
-@callback(
-    Output(component_id="key-stats", component_property="children"),
-    [Input(component_id="json-store-points", component_property="data"),
-     Input(component_id="key-stats-table-store", component_property="data"),
-     Input(component_id="court-figure-store", component_property="data")
-
-     ]
-)
-def plot_points(response, key_stats_df, court_df):
-    df = pd.DataFrame.from_dict(response)
-    court_df = pd.read_json(court_df, orient='split')
-
-    fig = go.Figure()
-
-    for x in court_df["type"].unique().tolist():
-        fig.add_trace(
-            go.Scatter(x=features.loc[features["type"] == x, "y"],
-                       y=features.loc[features["type"] == x, "x"],
-                       marker={"color": "black"}))
-
-    fig.update_traces(showlegend=False)
-
-    df["marker"] = np.where(df["missed"], "x", "circle-open")
+def shot_charts(bundle, game_code):
+    df = store.frame(bundle["points"])
 
     df_home = df.loc[df["home"], :]
     df_away = df.loc[~df["home"], :]
 
-    fig_home = fig.add_trace(go.Histogram2dContour(
-        x=df_home["COORD_X"].tolist(),
-        y=df_home["COORD_Y"].tolist(),
-        colorscale=['rgb(255, 255, 255)'] + px.colors.sequential.Magma[1:][::-1],
-        showscale=False,
-        line=dict(width=0),
-        hoverinfo='none',
-        xaxis="x",
-        yaxis="y"
-    )).add_trace(
-        go.Scatter(x=df_home["COORD_X"].tolist(),
-                   y=df_home["COORD_Y"].tolist(),
-                   mode='markers',
-                   marker=dict(
-                       symbol=df_home["marker"].tolist(),
-                       color='black',
-                       size=7,
-
-                   ),
-                   xaxis="x",
-                   yaxis="y",
-                   hoverinfo='none',
-                   customdata=np.stack((df_home['PLAYER'], df_home['ID_ACTION']), axis=-1),
-                   hovertemplate="<b>Player</b> %{customdata[0]} <br>" +
-                                 "<b>Shot Type</b> %{customdata[1]}"
-                   )).update_yaxes(
-        range=[-200, 1200],
-        gridcolor='White',
-        scaleanchor="x",
-        scaleratio=1,
-    ).update_xaxes(
-        range=[-800, 800],
-        gridcolor='White').update_traces(showlegend=False).update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)'
-    )
-
-    fig = go.Figure()
-
-    for x in court_df["type"].unique().tolist():
-        fig.add_trace(
-            go.Scatter(x=features.loc[features["type"] == x, "y"],
-                       y=features.loc[features["type"] == x, "x"],
-                       marker={"color": "black"}))
-
-    fig.update_traces(showlegend=False)
-
-    fig_away = fig.add_trace(go.Histogram2dContour(
-        x=df_away["COORD_X"].tolist(),
-        y=df_away["COORD_Y"].tolist(),
-        colorscale=['rgb(255, 255, 255)'] + px.colors.sequential.Magma[1:][::-1],
-        showscale=False,
-        line=dict(width=0),
-        hoverinfo='none',
-        xaxis="x",
-        yaxis="y"
-    )).add_trace(
-        go.Scatter(x=df_away["COORD_X"].tolist(),
-                   y=df_away["COORD_Y"].tolist(),
-                   mode='markers',
-                   marker=dict(
-                       symbol=df_away["marker"].tolist(),
-                       color='black',
-                       size=7
-                   ),
-                   xaxis="x",
-                   yaxis="y",
-                   hoverinfo='none',
-                   customdata=np.stack((df_away['PLAYER'], df_away['ID_ACTION']), axis=-1),
-                   hovertemplate="<b>Player</b> %{customdata[0]} <br>" +
-                                 "<b>Shot Type</b> %{customdata[1]}"
-                   )).update_yaxes(
-        range=[-200, 1200],
-        gridcolor='White',
-        scaleanchor="x",
-        scaleratio=1,
-    ).update_xaxes(
-        range=[-800, 800],
-        gridcolor='White').update_traces(showlegend=False).update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)'
-    )
+    fig_home = shots.shot_chart(df_home, sequential.Magma, nbins=20, marker_size=7)
+    fig_away = shots.shot_chart(df_away, sequential.Magma, nbins=20, marker_size=7)
 
     chart_home = html.Div(dcc.Graph(
         figure=fig_home,
@@ -355,111 +202,42 @@ def plot_points(response, key_stats_df, court_df):
         className="points",
         style={"width": "40%"})
 
-    table_mid = html.Div(children=key_stats_df, style={"width": "20%",
-                                                       "display": "flex",
-                                                       "justify-content": "center"})
-
-    return [chart_home, table_mid, chart_away]
-
-
-@callback(
-    Output(component_id="box-score", component_property="children"),
-    Input(component_id="json-store", component_property="data")
-)
-def update_boxscore(response):
-    df = pd.DataFrame.from_dict(response)
-
-    rp_quantile = requests.get(f"http://euroleague-api:8989/Quantile?type_quantile=player")
-    rp_quantile = rp_quantile.json()
-
-    df_quantile = pd.DataFrame.from_dict(rp_quantile)
-    quantiles = df_quantile["quantiles"].loc[0]
-
-    df["2FGA"] = df["2FGA"].replace(0, np.nan).astype("Int64")
-    df["3FGA"] = df["3FGA"].replace(0, np.nan).astype("Int64")
-    df["FTA"] = df["FTA"].replace(0, np.nan).astype("Int64")
-    df["PF"] = df["CM"] + df["CMT"] + df["CMU"] + df["OF"]
-    df["2FG"] = df["2FGM"].astype(str) + "/" + df["2FGA"].astype(str) + " (" + (100 * df['2FGM'] / df['2FGA']).round(
-        1).astype(str) + "%)"
-    df["3FG"] = df["3FGM"].astype(str) + "/" + df["3FGA"].astype(str) + " (" + (100 * df['3FGM'] / df['3FGA']).round(
-        1).astype(str) + "%)"
-    df["FT"] = df["FTM"].astype(str) + "/" + df["FTA"].astype(str) + " (" + (100 * df['FTM'] / df['FTA']).round(
-        1).astype(str) + "%)"
-    df["DREB"] = df["D"].astype(str) + " (" + (100 * df['DREBR']).round(1).astype(str) + "%)"
-    df["OREB"] = df["O"].astype(str) + " (" + (100 * df['OREBR']).round(1).astype(str) + "%)"
-    df["USG"] = (100 * df["usage"]).round(1).astype(str) + "%"
-    df["PER"] = (df["PER"]).round(1)
-    df["tmp"] = df["duration"] % 60
-    df["tmp"] = df.apply(lambda x: f"0{x['tmp']}" if x["tmp"] < 10 else f"{x['tmp']}", axis=1)
-    df["MIN"] = (df["duration"].fillna(0) / 60).astype(int).astype(str) + ":" + df["tmp"]
-    df["TREB"] = df["D"] + df["O"]
-
-    df = df.replace(0, np.nan)
-
-    df.loc[df["2FGA"].isna(), "2FG"] = np.nan
-    df.loc[df["3FGA"].isna(), "3FG"] = np.nan
-    df.loc[df["FTA"].isna(), "FT"] = np.nan
-
-    df = df.copy()
+    key_stats_table = dash_table.DataTable(
+        id='key-stats-table',
+        data=list(key_stats.game_key_stats(game_code, bundle["teams"])),
+        columns=table_specs.columns(key_stats.COLUMNS),
+        style_as_list_view=True,
+        style_data_conditional=table_specs.KEY_STATS_RULES,
+        style_header={"display": "none"},
+        fill_width=False
 
-    df["Name"] = "<a href='" + "/players/" + df["PLAYER_ID"] + "' style='vertical-align: middle '>" + df[
-        "playerName"] + "</a>"
+    )
 
-    df = df[
-        ["Name", "MIN", "pts", "USG", "2FG", "3FG", "FT", "DREB", "OREB", "TREB", "AS", "TO", "ST", "FV", "PF", "RV",
-         "PIR", "PER",
-         "home"]]
+    table_mid = html.Div(children=key_stats_table, style={"width": "20%",
+                                                         "display": "flex",
+                                                         "justify-content": "center"})
 
-    df_home = df.loc[df["home"], :]
-    df_away = df.loc[~df["home"], :]
-
-    del df_home["home"]
-    del df_away["home"]
+    return [chart_home, table_mid, chart_away]
 
-    df_dict_home = df_home.to_dict("records")
-    df_dict_away = df_away.to_dict("records")
 
-    cols = [{"name": i, "id": i} for i in df_home.columns[1:]]
-    cols.insert(0, {"name": "Name", "id": "Name", "presentation": "markdown"})
-    child_home = dash_table.DataTable(
-        id='box-score-table-home',
-        data=df_dict_home,
-        columns=cols,
+def box_score_table(table_id):
+    return dash_table.DataTable(
+        id=table_id,
+        data=[],
+        columns=table_specs.columns(BOX_SCORE_COLUMNS, markdown=("Name",)),
+        page_action="custom",
+        page_current=0,
+        page_size=paging.PAGE_SIZE,
+        sort_action="custom",
+        sort_mode="multi",
+        sort_by=[],
+        filter_action="custom",
+        filter_query="",
         style_cell={
                     "font-family": "sans-serif"},
         fill_width=False,
         markdown_options={"html": True},
-        style_data_conditional=[
-            {"if": {"column_id": "pts"},
-             "font-weight": "bold",
-             "text-align": "center"},
-            {"if": {"column_id": "Name"},
-             "verticalAlign": "middle"},
-            {"if": {"column_id": "PIR"},
-             "font-weight": "bold"}
-            ,
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} <= " + f"{quantiles[0]}"},
-             "color": "#9d9d9d"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} >" + f"{quantiles[0]}" + " && {PIR} <= " + f"{quantiles[1]}"},
-             "color": "#1eff00"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} > " + f"{quantiles[1]}" + " && {PIR} <= " + f"{quantiles[2]}"},
-             "color": "#0070dd"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} > " + f"{quantiles[2]}" + " && {PIR} <= " + f"{quantiles[3]}"},
-             "color": "#a335ee"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} > " + f"{quantiles[3]}" + " && {PIR} <= " + f"{quantiles[4]}"},
-             "color": "#ff8000"
-             }
-
-        ],
+        style_data_conditional=reference.pir_rules("player"),
         style_data={"text-align": "center",
                     "border-left-color": "#F9F9F9",
                     "border-right-color": "#F9F9F9",
@@ -470,140 +248,83 @@ def update_boxscore(response):
 
     )
 
-    child_away = dash_table.DataTable(
-        id='box-score-table-away',
-        data=df_dict_away,
-        columns=cols,
-        # style_header={"display": "none"},
-        style_cell={
-                    "font_family": "sans-serif"},
-        fill_width=False,
-        markdown_options={"html": True},
-        style_data_conditional=[
-            {"if": {"column_id": "pts"},
-             "font-weight": "bold",
-             "text-align": "center"},
-            {"if": {"column_id": "Name"},
-             "verticalAlign": "middle"
-             },
-            {"if": {"column_id": "PIR"},
-             "font-weight": "bold"}
-            ,
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} <= " + f"{quantiles[0]}"},
-             "color": "#9d9d9d"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} > " + f"{quantiles[0]}" + " && {PIR} <= " + f"{quantiles[1]}"},
-             "color": "#1eff00"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} > " + f"{quantiles[1]}" + " && {PIR} <= " + f"{quantiles[2]}"},
-             "color": "#0070dd"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} > " + f"{quantiles[2]}" + " && {PIR} <= " + f"{quantiles[3]}"},
-             "color": "#a335ee"
-             },
-            {"if": {"column_id": "PIR",
-                    "filter_query": "{PIR} > " + f"{quantiles[3]}" + " && {PIR} <= " + f"{quantiles[4]}"},
-             "color": "#ff8000"
-             }
-        ],
-        style_data={"text-align": "center",
-                    "border-left-color": "#F9F9F9",
-                    "border-right-color": "#F9F9F9",
-                    "border-left-width": "1px thin",
-                    "border-right-width": "1px thin"
-
-                    },
-        style_header={"textAlign": "center"}
-
-    )
-
-    return [child_home, html.Div(style={"width": "5%"}), child_away]
 
+def box_score_frame(players_key):
+    df = store.frame(players_key)
 
-@callback(
-    Output(component_id="json-store-assists", component_property="data"),
-    Input(component_id="game-code-store", component_property="data")
-)
-def call_assists_api(game_code):
-    response = requests.get(f"http://euroleague-api:8989/AssistsSingleGame?game_code={game_code}")
-    response = response.json()
-    return response
-
+    df["PF"] = df["CM"] + df["CMT"] + df["CMU"] + df["OF"]
+    df["2FG"] = formatting.shooting(df["2FGM"], df["2FGA"])
+    df["3FG"] = formatting.shooting(df["3FGM"], df["3FGA"])
+    df["FT"] = formatting.shooting(df["FTM"], df["FTA"])
+    df["DREB"] = formatting.count_pct(df["D"], df["DREBR"])
+    df["OREB"] = formatting.count_pct(df["O"], df["OREBR"])
+    df["USG"] = formatting.pct(df["usage"])
+    df["PER"] = (df["PER"]).round(1)
+    df["MIN"] = formatting.minutes(df["duration"])
+    df["TREB"] = df["D"] + df["O"]
 
-@callback(
-    Output(component_id="assist-charts", component_property="children"),
-    Input(component_id="json-store-assists", component_property="data"),
-)
-def plot_assist_charts(response):
-    def createDiGraph(df, players):
-        # Create a directed graph (digraph) object; i.e., a graph in which the edges
-        # have a direction associated with them.
-        G = nx.DiGraph()
+    df["Name"] = "<a href='" + "/players/" + df["PLAYER_ID"] + "' style='vertical-align: middle '>" + df[
+        "playerName"] + "</a>"
 
-        # Add nodes:
-        nodes = players
-        G.add_nodes_from(nodes)
+    values = {"Name": df["playerName"], "MIN": df["duration"] / 60, "USG": 100 * df["usage"], "2FG": df["2FGM"],
+              "3FG": df["3FGM"], "FT": df["FTM"], "DREB": df["D"], "OREB": df["O"]}
 
-        # Add edges or links between the nodes:
-        edges = [(x, y) for x, y in zip(df["playerNameAssisting"], df["playerName"])]
-        edge_labels = {tup: lab for tup, lab in zip(edges, df["count"])}
-        node_labels = {x: x for x in nodes}
+    df = df[[*BOX_SCORE_COLUMNS, "home"]].replace(0, np.nan)
+    df = df.assign(**{paging.value_column(column): value for column, value in values.items()})
+    df["home"] = df["home"].astype(bool)
 
-        G.add_edges_from(edges)
-        nx.set_edge_attributes(G, edge_labels, "edge_prop")
-        nx.set_node_attributes(G, node_labels, "node_prop")
+    return df
 
-        return G
 
-    df = pd.DataFrame.from_dict(response)
-    df["count"] = 1
+def box_score_pages(bundle, *table_state):
+    # one prepared frame per game, each table interaction only serialises its visible page
+    df = paging.prepared("box-score", bundle["players"], lambda: box_score_frame(bundle["players"]))
 
-    df = df.groupby(["playerNameAssisting", "playerName", "home"]).agg({"count": "sum"}).reset_index()
+    data_home, pages_home = paging.page(df.loc[df["home"]], *table_state[:4], columns=BOX_SCORE_COLUMNS)
+    data_away, pages_away = paging.page(df.loc[~df["home"]], *table_state[4:], columns=BOX_SCORE_COLUMNS)
 
-    df_home = df.loc[df["home"], :]
-    df_away = df.loc[~df["home"], :]
+    return data_home, pages_home, data_away, pages_away
 
-    del df_home["home"]
-    del df_away["home"]
 
-    players_home = pd.concat([df_home["playerNameAssisting"], df_home["playerName"]]).unique()
-    players_away = pd.concat([df_away["playerNameAssisting"], df_away["playerName"]]).unique()
+@callback(
+    Output("box-score-table-home", "data"),
+    Output("box-score-table-home", "page_count"),
+    Output("box-score-table-away", "data"),
+    Output("box-score-table-away", "page_count"),
+    Input("box-score-table-home", "page_current"),
+    Input("box-score-table-home", "page_size"),
+    Input("box-score-table-home", "sort_by"),
+    Input("box-score-table-home", "filter_query"),
+    Input("box-score-table-away", "page_current"),
+    Input("box-score-table-away", "page_size"),
+    Input("box-score-table-away", "sort_by"),
+    Input("box-score-table-away", "filter_query"),
+    State(component_id="json-store-game", component_property="data"),
+    prevent_initial_call=True
+)
+def update_boxscore(*table_state_and_bundle):
+    # the first page comes with render_game, this only follows paging, sorting and filtering
+    *table_state, bundle = table_state_and_bundle
+    if not bundle:
+        raise PreventUpdate
 
-    home_graph = createDiGraph(df_home, players_home)
-    away_graph = createDiGraph(df_away, players_away)
+    loaders.sync_game(bundle["players"]["params"]["game_code"])
+    return box_score_pages(bundle, *table_state)
 
-    home_plot = ig.plot(home_graph, size_method="static",
-                        color_method="#ffcccb",
-                        edge_label="edge_prop",
-                        node_label="node_prop",
-                        edge_label_position="bottom center",
-                        layout="circular").update_traces(marker_showscale=False).update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)'
-    )
 
-    away_plot = ig.plot(away_graph, size_method="static",
-                        color_method="#164E9B",
-                        edge_label="edge_prop",
-                        edge_label_position="bottom center",
-                        node_label="node_prop",
-                        layout="circular").update_traces(marker_showscale=False).update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)'
-    )
+def assist_charts(bundle, game_code):
+    home_plot, away_plot = assist_network.game_networks(game_code, store.frame(bundle["assists"]))
 
     return [dcc.Graph(figure=home_plot), html.Div(style={"width": "5%"}), dcc.Graph(figure=away_plot)]
 
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="navigation", function_name="game"),
     Output("location-game", "pathname"),
+    Input(component_id="submit-val-game", component_property="n_clicks"),
     State(component_id="game-code-input", component_property="value"),
-    Input(component_id="submit-val-game", component_property="n_clicks")
-
+    prevent_initial_call=True
 )
-def navigate_to_game_url(val, n_clicks):
-    return f"/game/{val}"
+
+
+warmer.register("game", prerender_game)
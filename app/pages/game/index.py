@@ -1,12 +1,5 @@
 import dash
-import numpy as np
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
-import plotly.express as px
-import pandas as pd
-import requests
-import igviz as ig
-import networkx as nx
-import plotly.graph_objects as go
+from dash import html, dcc, clientside_callback, ClientsideFunction, Output, Input, State
 
 dash.register_page(__name__, path="/game")
 
@@ -28,12 +21,10 @@ def layout():
     return layout_local
 
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="navigation", function_name="game"),
     Output("location-game-index", "pathname"),
-    State(component_id="game-code-input-index", component_property="value"),
     Input(component_id="submit-val-game-index", component_property="n_clicks"),
+    State(component_id="game-code-input-index", component_property="value"),
     prevent_initial_call=True
-
 )
-def navigate_to_game_url(val, n_clicks):
-    return f"/game/{val}"
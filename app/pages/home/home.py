@@ -1,12 +1,5 @@
 import dash
-import numpy as np
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
-import plotly.express as px
-import pandas as pd
-import requests
-import igviz as ig
-import networkx as nx
-import plotly.graph_objects as go
+from dash import html
 
 dash.register_page(__name__, path="/")
 
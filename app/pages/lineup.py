@@ -1,10 +1,7 @@
 import dash
-import dash_bootstrap_components as dbc
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
+from dash import html, dcc, dash_table, callback, clientside_callback, ClientsideFunction, Output, Input, State
 from dash.exceptions import PreventUpdate
-import plotly.express as px
-import pandas as pd
-import requests
+from utils import api
 
 dash.register_page(__name__,  location="none")
 
@@ -30,18 +27,12 @@ layout = html.Div(
 def call_game_lineups_api(n_clicks, game_code):
     if game_code < 1:
         raise PreventUpdate
-    response = requests.get(f"http://euroleague-api:8989/LineupSingleGameStats?game_code={game_code}")
-    response = response.json()
+    response = api.get("LineupSingleGameStats", game_code=game_code)
     return response
 
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="tables", function_name="records"),
     Output(component_id="lineups-data-table", component_property="data"),
-    # Output(component_id="teams-data-table", component_property="columns"),
     Input(component_id="json-store-lineup", component_property="data")
 )
-def update_lineup_table(data):
-    # df = pd.DataFrame.from_dict(data)
-    # col_dict = [{"name": x, "id": x} for x in df.columns]
-
-    return data
\ No newline at end of file
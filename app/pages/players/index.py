@@ -1,28 +1,19 @@
 import dash
-import numpy as np
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
-import plotly.express as px
-import pandas as pd
-import requests
-import igviz as ig
-import networkx as nx
-import plotly.graph_objects as go
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Output, Input, State
+from dash.exceptions import PreventUpdate
+from utils import directory
 
 dash.register_page(__name__, path="/players")
 
 
 def layout():
-    init_player = requests.get(f"http://euroleague-api:8989/InitPlayer")
-    init_player = init_player.json()
-    init_player = pd.DataFrame.from_dict(init_player)
-
-    options = {y: x for x, y in zip(init_player["playerName"], init_player["PLAYER_ID"])}
-
     layout_local = html.Div(children=[
         html.Div([html.Div(dcc.Dropdown(
-            options=options,
-            value=[],
-            id="dropdown-player-index"
+            options=[],
+            value=None,
+            id="dropdown-player-index",
+            placeholder="Search players",
+            search_order="original"
 
         ),
             style={"width": "50%"}),
@@ -35,13 +26,24 @@ def layout():
 
 
 @callback(
+    Output("dropdown-player-index", "options"),
+    Input("dropdown-player-index", "search_value"),
+    State("dropdown-player-index", "value"),
+    prevent_initial_call=True
+)
+def search_players(search_value, value):
+    if not search_value:
+        raise PreventUpdate
+    return directory.search_options(search_value, value)
+
+
+clientside_callback(
+    ClientsideFunction(namespace="navigation", function_name="player"),
     Output("location-player-index", "pathname"),
-    State(component_id="dropdown-player-index", component_property="value"),
     Input(component_id="submit-val-player-index", component_property="n_clicks"),
+    State(component_id="dropdown-player-index", component_property="value"),
     prevent_initial_call=True
 )
-def navigate_to_url(val, n_clicks):
-    return f"/players/{val}"
 
 
 
@@ -1,28 +1,19 @@
 import dash
-import numpy as np
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
-import plotly.express as px
-import pandas as pd
-import requests
-import igviz as ig
-import networkx as nx
-import plotly.graph_objects as go
+from dash import html, dcc, clientside_callback, ClientsideFunction, Output, Input, State
+from utils import api
 
 dash.register_page(__name__, path="/teams")
 
 
 def layout():
 
-    init_team = requests.get(f"http://euroleague-api:8989/SeasonTeams")
-    init_team = init_team.json()
-    init_team = pd.DataFrame.from_dict(init_team)
-
-    options = {y: x for x, y in zip(init_team["team_name"], init_team["CODETEAM"])}
+    init_team = api.get("SeasonTeams")
+    options = {x["CODETEAM"]: x["team_name"] for x in init_team}
 
     layout_local = html.Div(children=[
         html.Div([html.Div(dcc.Dropdown(
             options=options,
-            value=[],
+            value=None,
             id="dropdown-team-index"
 
         ),
@@ -35,13 +26,12 @@ def layout():
     return layout_local
 
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="navigation", function_name="team"),
     Output("location-team-index", "pathname"),
-    State(component_id="dropdown-team-index", component_property="value"),
     Input(component_id="submit-val-team-index", component_property="n_clicks"),
+    State(component_id="dropdown-team-index", component_property="value"),
     prevent_initial_call=True
 )
-def navigate_to_url(val, n_clicks):
-    return f"/teams/{val}"
 
 
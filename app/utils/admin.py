@@ -0,0 +1,36 @@
+import functools
+import hmac
+import logging
+import os
+
+from flask import abort, request
+
+# internal endpoints (stats, cache control) next to the public pages. They are only registered when
+# EUROLEAGUE_ADMIN_TOKEN is set, and only answer requests with "Authorization: Bearer <token>".
+
+logger = logging.getLogger(__name__)
+
+ADMIN_TOKEN = os.environ.get("EUROLEAGUE_ADMIN_TOKEN")
+
+
+def authorized():
+    supplied = request.headers.get("Authorization", "")
+    return hmac.compare_digest(supplied.encode(), f"Bearer {ADMIN_TOKEN}".encode())
+
+
+def route(server, rule, **options):
+    def register(view):
+        if not ADMIN_TOKEN:
+            logger.info("EUROLEAGUE_ADMIN_TOKEN is not set, %s is disabled", rule)
+            return view
+
+        @functools.wraps(view)
+        def guarded(*args, **kwargs):
+            if not authorized():
+                abort(403)
+            return view(*args, **kwargs)
+
+        server.route(rule, **options)(guarded)
+        return view
+
+    return register
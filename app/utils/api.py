@@ -0,0 +1,232 @@
+import functools
+import os
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.cache import make_cache
+
+# shared client for the euroleague-api backend, one pooled keep-alive session per (gunicorn worker) process
+
+API_URL = os.environ.get("EUROLEAGUE_API_URL", "http://euroleague-api:8989")
+CONNECT_TIMEOUT = float(os.environ.get("EUROLEAGUE_API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.environ.get("EUROLEAGUE_API_READ_TIMEOUT", "20"))
+MAX_RETRIES = int(os.environ.get("EUROLEAGUE_API_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.environ.get("EUROLEAGUE_API_BACKOFF", "0.3"))
+POOL_SIZE = int(os.environ.get("EUROLEAGUE_API_POOL_SIZE", "16"))
+
+REFERENCE_TTL = float(os.environ.get("EUROLEAGUE_API_REFERENCE_TTL", str(6 * 60 * 60)))
+SEASON_TTL = float(os.environ.get("EUROLEAGUE_API_SEASON_TTL", str(15 * 60)))
+
+# reference data changes at most once per game day
+ENDPOINT_TTL = {
+    "SeasonTeams": REFERENCE_TTL,
+    "InitPlayer": REFERENCE_TTL,
+    "Quantile": REFERENCE_TTL,
+    "Team": SEASON_TTL,
+    "Player": SEASON_TTL,
+    "PointsTeam": SEASON_TTL,
+    "PointsPlayer": SEASON_TTL,
+    "AssistsPlayer": SEASON_TTL,
+    "GamePlayers": SEASON_TTL,
+    "Game": SEASON_TTL,
+}
+
+# queried by game_code alone these never change once the game is finished, then they are kept until evicted;
+# a game still being played (or ingested) expires like season data
+GAME_ENDPOINTS = {"GamePlayers", "GameLite", "PointsSingleGame", "AssistsSingleGame", "LineupSingleGameStats"}
+
+# columnar bodies are only asked for when pyarrow is importable, "json" turns the negotiation off
+WIRE_FORMAT = os.environ.get("EUROLEAGUE_API_WIRE_FORMAT", "arrow")
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+
+_cache = make_cache("api")
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+_latency = {}
+_latency_lock = threading.Lock()
+
+# every game with a lower game_code is over, kept up to date by loaders.track_finished_games
+_finished_before = 0
+
+
+def _build_session():
+    retry = Retry(total=MAX_RETRIES,
+                  connect=MAX_RETRIES,
+                  read=MAX_RETRIES,
+                  status=MAX_RETRIES,
+                  backoff_factor=BACKOFF_FACTOR,
+                  status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset(["GET"]),
+                  raise_on_status=False)
+
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+def get_session():
+    # a session created before fork (e.g. with preload_app) must not be shared with the workers
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+
+    return _session
+
+
+def _record_latency(endpoint, elapsed, failed):
+    with _latency_lock:
+        stats = _latency.setdefault(endpoint, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["errors"] += int(failed)
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+
+
+def latency_stats():
+    with _latency_lock:
+        return {endpoint: {**stats, "mean": stats["total"] / stats["count"] if stats["count"] else 0.0}
+                for endpoint, stats in _latency.items()}
+
+
+def reset_latency_stats():
+    with _latency_lock:
+        _latency.clear()
+
+
+def cache_key(endpoint, params):
+    return f"{endpoint}?{urlencode(sorted(params.items()), doseq=True)}"
+
+
+def set_finished_before(game_code):
+    global _finished_before
+    _finished_before = int(game_code)
+
+
+def game_finished(game_code):
+    try:
+        return int(game_code) < _finished_before
+    except (TypeError, ValueError):
+        return False
+
+
+def cache_ttl(endpoint, params):
+    # returns (cacheable, ttl)
+    if endpoint in GAME_ENDPOINTS and set(params) == {"game_code"}:
+        return True, None if game_finished(params["game_code"]) else SEASON_TTL
+    if endpoint in ENDPOINT_TTL:
+        return True, ENDPOINT_TTL[endpoint]
+
+    return False, None
+
+
+def invalidate(endpoint, **params):
+    _cache.delete(cache_key(endpoint, params))
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def _request(endpoint, params, decode, headers=None):
+    start = time.perf_counter()
+    failed = True
+    try:
+        response = get_session().get(f"{API_URL}/{endpoint}",
+                                     params=params or None,
+                                     headers=headers,
+                                     timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        response.raise_for_status()
+        data = decode(response)
+        failed = False
+    finally:
+        _record_latency(endpoint, time.perf_counter() - start, failed)
+
+    return data
+
+
+def fetch(endpoint, **params):
+    return _request(endpoint, params, lambda response: response.json())
+
+
+def json_frame(data):
+    # pandas is only needed once frames are built, the index pages import this module without it
+    import pandas as pd
+
+    # single-record endpoints (Player?player_id=, Team?team=) answer with one object
+    if isinstance(data, dict):
+        return pd.DataFrame(data, index=[0])
+    return pd.DataFrame.from_dict(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _accept_header():
+    if WIRE_FORMAT == "json":
+        return None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+
+    return f"{ARROW_STREAM}, {PARQUET};q=0.9, application/json;q=0.5"
+
+
+def _decode_frame(response):
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+    if content_type not in (ARROW_STREAM, PARQUET):
+        return json_frame(response.json())
+
+    import pyarrow as pa
+
+    buffer = pa.py_buffer(response.content)
+    if content_type == ARROW_STREAM:
+        table = pa.ipc.open_stream(buffer).read_all()
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(pa.BufferReader(buffer))
+
+    # column blocks are handed to pandas without consolidating, numeric columns stay zero-copy
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def fetch_frame(endpoint, **params):
+    # asks for an Arrow IPC stream (or Parquet) and falls back to JSON when the backend can't send one
+    accept = _accept_header()
+    headers = {"Accept": accept} if accept else None
+
+    return _request(endpoint, params, _decode_frame, headers)
+
+
+def get(endpoint, **params):
+    cacheable, ttl = cache_ttl(endpoint, params)
+    if not cacheable:
+        return fetch(endpoint, **params)
+
+    key = cache_key(endpoint, params)
+    data = _cache.get(key, None)
+    if data is not None:
+        return data
+
+    data = fetch(endpoint, **params)
+    # an empty answer for a game usually means it has not been played yet, don't pin it
+    if data or ttl is not None:
+        _cache.set(key, data, ttl=ttl)
+
+    return data
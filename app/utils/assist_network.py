@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import MemoryCache, MISSING
+
+# assist networks (who assisted whom) as plain plotly figure dicts. The circular layout is closed-form and
+# computed with numpy; networkx is only imported for the other layouts. Figures are memoized per game.
+
+NODE_SIZE = 28
+ARROW_SHORTEN = 0.15
+NETWORK_CACHE_SIZE = int(os.environ.get("EUROLEAGUE_NETWORK_CACHE_SIZE", "256"))
+
+_networks = MemoryCache(max_size=NETWORK_CACHE_SIZE)
+
+
+def circular_positions(n_nodes):
+    # same positions as nx.circular_layout: evenly spaced on the unit circle, centred and rescaled to [-1, 1]
+    if n_nodes < 2:
+        return np.zeros((n_nodes, 2))
+
+    theta = 2 * np.pi * np.arange(n_nodes) / n_nodes
+    positions = np.column_stack((np.cos(theta), np.sin(theta)))
+    positions -= positions.mean(axis=0)
+
+    return positions / np.abs(positions).max()
+
+
+def _networkx_positions(labels, source, target, layout):
+    import networkx as nx
+
+    layouts = {
+        "random": nx.random_layout,
+        "kamada": nx.kamada_kawai_layout,
+        "planar": nx.planar_layout,
+        "spring": nx.spring_layout,
+        "spectral": nx.spectral_layout,
+        "spiral": nx.spiral_layout,
+    }
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(len(labels)))
+    graph.add_edges_from(zip(source.tolist(), target.tolist()))
+    positions = layouts[layout](graph)
+
+    return np.array([positions[node] for node in range(len(labels))]).reshape(-1, 2)
+
+
+def node_positions(labels, source, target, layout="circular"):
+    if layout == "circular":
+        return circular_positions(len(labels))
+
+    return _networkx_positions(labels, source, target, layout)
+
+
+def _segments(start, end):
+    # one NaN-separated line trace for all edges
+    return np.column_stack((start, end, np.full(len(start), np.nan))).ravel()
+
+
+def network_figure(df, color, layout="circular"):
+    # df: one row per (playerNameAssisting, playerName) with the number of assists in "count"
+    codes, labels = pd.factorize(pd.concat([df["playerNameAssisting"], df["playerName"]]))
+    source, target = codes[:len(df)], codes[len(df):]
+    labels = labels.to_numpy(dtype=object)
+
+    positions = node_positions(labels, source, target, layout)
+    x, y = positions[:, 0], positions[:, 1]
+    degree = np.bincount(codes, minlength=len(labels))
+
+    edge_trace = {"type": "scatter",
+                  "x": _segments(x[source], x[target]),
+                  "y": _segments(y[source], y[target]),
+                  "mode": "lines",
+                  "line": {"width": 1, "color": "#888"},
+                  "hoverinfo": "none"}
+
+    node_trace = {"type": "scatter",
+                  "x": x,
+                  "y": y,
+                  "mode": "markers+text",
+                  "text": labels,
+                  "hovertext": [f"Node: {label}<br>Degree: {count}" for label, count in zip(labels, degree)],
+                  "hoverinfo": "text",
+                  "textposition": "bottom center",
+                  "marker": {"size": NODE_SIZE, "color": color, "opacity": 0.8, "line": {"width": 0}}}
+
+    # edge labels sit on invisible markers at the midpoints
+    label_trace = {"type": "scatter",
+                   "x": (x[source] + x[target]) / 2,
+                   "y": (y[source] + y[target]) / 2,
+                   "mode": "markers+text",
+                   "text": df["count"].to_numpy(),
+                   "hoverinfo": "text",
+                   "textposition": "bottom center",
+                   "marker": {"opacity": 0}}
+
+    # arrow heads stop short of the target node
+    arrow_x = x[target] * (1 - ARROW_SHORTEN) + x[source] * ARROW_SHORTEN
+    arrow_y = y[target] * (1 - ARROW_SHORTEN) + y[source] * ARROW_SHORTEN
+    arrows = [{"ax": ax, "ay": ay, "x": tx, "y": ty, "axref": "x", "ayref": "y", "xref": "x", "yref": "y",
+               "showarrow": True, "arrowhead": 1, "arrowsize": 2}
+              for ax, ay, tx, ty in zip(x[source].tolist(), y[source].tolist(), arrow_x.tolist(), arrow_y.tolist())]
+
+    hidden_axis = {"showgrid": False, "zeroline": False, "showticklabels": False}
+    return {"data": [edge_trace, node_trace, label_trace],
+            "layout": {"title": {"text": "Graph"},
+                       "showlegend": False,
+                       "hovermode": "closest",
+                       "margin": {"b": 20, "l": 5, "r": 5, "t": 40},
+                       "annotations": arrows,
+                       "xaxis": hidden_axis,
+                       "yaxis": hidden_axis,
+                       "paper_bgcolor": "rgba(0,0,0,0)",
+                       "plot_bgcolor": "rgba(0,0,0,0)"}}
+
+
+def game_networks(game_code, df_assists, colors=("#ffcccb", "#164E9B"), layout="circular"):
+    # home and away figures, memoized per game; a live game only ever gains assists, a corrected one is
+    # dropped with invalidate
+    version = (len(df_assists), colors, layout)
+    cached = _networks.get(str(game_code))
+    if cached is not MISSING and cached[0] == version:
+        return cached[1]
+
+    df = df_assists.groupby(["playerNameAssisting", "playerName", "home"]).size().rename("count").reset_index()
+    home = df["home"].astype(bool)
+
+    figures = (network_figure(df.loc[home], colors[0], layout),
+               network_figure(df.loc[~home], colors[1], layout))
+
+    _networks.set(str(game_code), (version, figures))
+    return figures
+
+
+def invalidate(game_code):
+    _networks.delete(str(game_code))
@@ -0,0 +1,28 @@
+import logging
+import os
+
+# optional background callback manager, off by default. With EUROLEAGUE_BACKGROUND_DIR set long page renders run
+# as Dash background callbacks (diskcache comes with dash[diskcache]), the sections they push with set_props then
+# reach the browser one by one instead of all at the end of the request.
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_DIR = os.environ.get("EUROLEAGUE_BACKGROUND_DIR")
+
+
+def make_manager(directory=BACKGROUND_DIR):
+    if not directory:
+        return None
+
+    try:
+        import diskcache
+    except ImportError:
+        logger.warning("diskcache is not installed, background callbacks are disabled")
+        return None
+
+    from dash import DiskcacheManager
+
+    return DiskcacheManager(diskcache.Cache(directory))
+
+
+MANAGER = make_manager()
@@ -0,0 +1,118 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# TTL + LRU caches; ttl=None keeps an entry until it is evicted by the size bound
+
+CACHE_BACKEND = os.environ.get("EUROLEAGUE_CACHE_BACKEND", "memory")
+# point this at /dev/shm to share entries across workers through shared memory instead of disk
+CACHE_DIR = os.environ.get("EUROLEAGUE_CACHE_DIR", "/tmp/euroleague-dashboard-cache")
+CACHE_SIZE = int(os.environ.get("EUROLEAGUE_CACHE_SIZE", "2048"))
+
+MISSING = object()
+
+
+class MemoryCache:
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires = entry
+            if expires is not None and expires <= time.time():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+
+    def __init__(self, path, max_size=CACHE_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS entries ("
+                         "key TEXT PRIMARY KEY, value BLOB, expires REAL, accessed REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _connect(self):
+        # sqlite connections are neither fork- nor thread-safe, keep one per (pid, thread)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        return conn
+
+    def get(self, key, default=MISSING):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+
+        value, expires = row
+        if expires is not None and expires <= now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return default
+
+        conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return pickle.loads(value)
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO entries (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                     (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires, now))
+        conn.execute("DELETE FROM entries WHERE key IN ("
+                     "SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_size,))
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM entries")
+
+
+def make_cache(name, backend=CACHE_BACKEND, max_size=CACHE_SIZE):
+    if backend == "memory":
+        return MemoryCache(max_size=max_size)
+    if backend == "disk":
+        return DiskCache(os.path.join(CACHE_DIR, f"{name}.sqlite"), max_size=max_size)
+
+    raise ValueError(f"unknown cache backend: {backend}")
@@ -0,0 +1,96 @@
+import copy
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# court outline geometry, built once per process from assets/features.csv
+
+FEATURES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "features.csv")
+SIMPLIFY_TOLERANCE = float(os.environ.get("EUROLEAGUE_COURT_TOLERANCE", "0.5"))
+
+
+def simplify_polyline(points, tolerance=SIMPLIFY_TOLERANCE):
+    # Ramer-Douglas-Peucker with an explicit stack, distances for each span are computed in one numpy pass
+    n = len(points)
+    if n < 3:
+        return points
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        start, end = points[first], points[last]
+        segment = end - start
+        inner = points[first + 1:last] - start
+        norm = np.hypot(*segment)
+        if norm == 0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / norm
+
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return points[keep]
+
+
+@functools.lru_cache(maxsize=None)
+def court_lines(tolerance=SIMPLIFY_TOLERANCE):
+    features = pd.read_csv(FEATURES_PATH)
+
+    lines = {}
+    for court_type, group in features.groupby("type", sort=False):
+        # the outline is stored rotated, plots use x as the vertical axis
+        points = group[["y", "x"]].to_numpy(dtype=np.float64)
+        points = simplify_polyline(points, tolerance)
+        lines[court_type] = (points[:, 0], points[:, 1])
+
+    return lines
+
+
+@functools.lru_cache(maxsize=None)
+def _base_figure():
+    # the whole outline as a single NaN-separated trace
+    lines = court_lines()
+    x = np.concatenate([np.append(line_x, np.nan) for line_x, _ in lines.values()])
+    y = np.concatenate([np.append(line_y, np.nan) for _, line_y in lines.values()])
+
+    fig = go.Figure(go.Scatter(x=x,
+                               y=y,
+                               mode="lines",
+                               line={"color": "black"},
+                               hoverinfo="skip",
+                               connectgaps=False))
+
+    fig.update_yaxes(
+        range=[-200, 1200],
+        gridcolor='White',
+        scaleanchor="x",
+        scaleratio=1,
+    ).update_xaxes(
+        range=[-800, 800],
+        gridcolor='White').update_layout(
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+
+    return fig.to_dict()
+
+
+def court_figure():
+    # cheap copy of the prebuilt court, callers only add their shot layers;
+    # the base was validated when it was built so the copy skips validation
+    return go.Figure(copy.deepcopy(_base_figure()), _validate=False)
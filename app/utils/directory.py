@@ -0,0 +1,125 @@
+import logging
+import os
+import threading
+import unicodedata
+from collections import Counter
+
+from utils import api, scheduler
+
+# searchable player directory: InitPlayer is loaded once per process and refreshed in the background,
+# dropdowns query it through a search_value callback instead of embedding every player in the layout
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = float(os.environ.get("EUROLEAGUE_DIRECTORY_REFRESH", str(60 * 60)))
+MAX_RESULTS = int(os.environ.get("EUROLEAGUE_DIRECTORY_RESULTS", "20"))
+MIN_TRIGRAM_SCORE = 0.3
+
+_index = None
+_lock = threading.Lock()
+
+
+def normalize(text):
+    # case and accent insensitive: "Mačiulis" matches "maciulis"
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _tokens(text):
+    return [token for token in normalize(text).replace(",", " ").replace(".", " ").split() if token]
+
+
+def _trigrams(text):
+    padded = f"  {' '.join(_tokens(text))} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_index(players):
+    # players: [{"PLAYER_ID": ..., "playerName": ...}]
+    names = {}
+    prefixes = {}
+    trigrams = {}
+
+    for player in players:
+        player_id, name = player["PLAYER_ID"], player["playerName"]
+        names[player_id] = name
+
+        for token in _tokens(name):
+            for end in range(1, len(token) + 1):
+                prefixes.setdefault(token[:end], set()).add(player_id)
+        for trigram in _trigrams(name):
+            trigrams.setdefault(trigram, set()).add(player_id)
+
+    ordered = sorted(names, key=lambda player_id: normalize(names[player_id]))
+    return {"names": names, "order": {player_id: rank for rank, player_id in enumerate(ordered)},
+            "prefixes": prefixes, "trigrams": trigrams}
+
+
+def refresh():
+    global _index
+
+    try:
+        index = build_index(api.fetch("InitPlayer"))
+    except Exception:
+        # keep serving the previous directory if the upstream is unavailable
+        logger.exception("could not refresh the player directory")
+        if _index is None:
+            raise
+        return
+
+    with _lock:
+        _index = index
+
+
+def _ensure_loaded():
+    scheduler.every("directory-refresh", REFRESH_INTERVAL, refresh)
+    if _index is None:
+        refresh()
+
+    return _index
+
+
+def name(player_id):
+    return _ensure_loaded()["names"].get(player_id)
+
+
+def search(query, limit=MAX_RESULTS):
+    index = _ensure_loaded()
+    tokens = _tokens(query or "")
+    if not tokens:
+        return []
+
+    # every query token must start one of the name's tokens, in any order ("sergio ll" finds "LLULL, SERGIO")
+    matches = set.intersection(*(index["prefixes"].get(token, set()) for token in tokens))
+    if matches:
+        return sorted(matches, key=index["order"].get)[:limit]
+
+    # nothing by prefix, fall back to trigram similarity to forgive typos
+    query_trigrams = _trigrams(query)
+    scores = Counter()
+    for trigram in query_trigrams:
+        scores.update(index["trigrams"].get(trigram, ()))
+
+    threshold = MIN_TRIGRAM_SCORE * len(query_trigrams)
+    ranked = sorted((player_id for player_id, score in scores.items() if score >= threshold),
+                    key=lambda player_id: (-scores[player_id], index["order"][player_id]))
+
+    return ranked[:limit]
+
+
+def options(player_ids):
+    names = _ensure_loaded()["names"]
+    return [{"label": names[player_id], "value": player_id} for player_id in player_ids if player_id in names]
+
+
+def search_options(query, selected=None, limit=MAX_RESULTS):
+    # the dropdown filters the options again in the browser (every typed token must be part of the label, value
+    # or "search"), so the matches carry the normalized name and the query to survive accent and typo matching
+    matches = [{**option, "search": f"{normalize(option['label'])} {query}"}
+               for option in options(search(query, limit))]
+
+    # the selected player stays in the options, otherwise the dropdown would lose its label
+    if selected and selected not in {option["value"] for option in matches}:
+        matches = [*options([selected]), *matches]
+
+    return matches
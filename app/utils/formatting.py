@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+# column-wise formatting shared by the tables, every helper takes and returns whole series.
+# assets/clientside.js (format) has single-value versions of minutes, pct and count_pct, keep them in step
+
+
+def minutes(seconds):
+    # 754 -> "12:34"
+    seconds = pd.Series(seconds).fillna(0).astype(np.int64)
+    return (seconds // 60).astype(str) + ":" + (seconds % 60).astype(str).str.zfill(2)
+
+
+def pct(rate, decimals=1):
+    # 0.4567 -> "45.7%", missing rates stay missing
+    rate = pd.Series(rate).astype(np.float64)
+    return ((100 * rate).round(decimals).astype(str) + "%").where(rate.notna())
+
+
+def count_pct(count, rate, decimals=1):
+    # 5, 0.25 -> "5 (25.0%)"
+    return pd.Series(count).astype(str) + " (" + pct(rate, decimals) + ")"
+
+
+def shooting(made, attempted, decimals=1):
+    # 3, 4 -> "3/4 (75.0%)", missing when there were no attempts
+    made = pd.Series(made)
+    attempted = pd.Series(attempted).replace(0, np.nan).astype(np.float64)
+
+    text = made.astype(str) + "/" + attempted.astype("Int64").astype(str) + " (" + pct(made / attempted,
+                                                                                       decimals) + ")"
+    return text.where(attempted.notna())
+
+
+def rounded(df, columns, decimals=1):
+    df[columns] = df[columns].astype(np.float64).round(decimals)
+    return df
+
+
+def pct_columns(df, columns, decimals=1):
+    for column in columns:
+        df[column] = pct(df[column], decimals)
+    return df
@@ -0,0 +1,34 @@
+import os
+import threading
+import time
+
+from utils.cache import CACHE_DIR, DiskCache
+
+# invalidation generations shared by every worker on the host, whatever the cache backends (a small sqlite file
+# in EUROLEAGUE_CACHE_DIR). Invalidating bumps a name's generation, every other worker drops its own copies the
+# next time it checks the name and finds a generation it has not seen yet.
+
+GENERATIONS_SIZE = int(os.environ.get("EUROLEAGUE_GENERATIONS_SIZE", "4096"))
+
+_shared = DiskCache(os.path.join(CACHE_DIR, "generations.sqlite"), max_size=GENERATIONS_SIZE)
+
+_seen = {}
+_seen_lock = threading.Lock()
+
+
+def bump(name):
+    generation = time.time_ns()
+    _shared.set(name, generation)
+    with _seen_lock:
+        _seen[name] = generation
+
+
+def outdated(name):
+    # True (once per worker) when another worker bumped name since this one last looked
+    generation = _shared.get(name, 0)
+    with _seen_lock:
+        if _seen.get(name, 0) == generation:
+            return False
+        _seen[name] = generation
+
+    return True
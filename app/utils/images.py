@@ -0,0 +1,126 @@
+import functools
+import hashlib
+import io
+import json
+import os
+
+import dash
+from dash import html
+from flask import send_from_directory
+
+# resized, content-hashed WebP/AVIF variants of the logos and player photos.
+# Build them with `python -m utils.images` from the app directory (needs Pillow); pages fall back
+# to the original PNGs from assets/ when no variant has been built.
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(APP_DIR, "assets")
+IMAGES_DIR = os.environ.get("EUROLEAGUE_IMAGES_DIR", os.path.join(APP_DIR, "static", "img"))
+MANIFEST_PATH = os.path.join(IMAGES_DIR, "manifest.json")
+
+ROUTE = "/img"
+MAX_AGE = 365 * 24 * 60 * 60
+
+# widths per asset group, as found under assets/
+VARIANT_WIDTHS = {
+    "photos": (160, 320, 480),
+    "": (64, 128, 256),
+}
+FORMATS = (("avif", "image/avif", {"quality": 50, "speed": 8}),
+           ("webp", "image/webp", {"quality": 75, "method": 4}))
+
+
+def _sources():
+    for group in VARIANT_WIDTHS:
+        folder = os.path.join(ASSETS_DIR, group)
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(".png"):
+                yield group, os.path.join(group, name) if group else name
+
+
+def build(force=False):
+    from PIL import Image, features
+
+    manifest = {} if force else load_manifest()
+    formats = [fmt for fmt in FORMATS if features.check(fmt[0])]
+
+    for group, asset in _sources():
+        source_path = os.path.join(ASSETS_DIR, asset)
+        mtime = os.path.getmtime(source_path)
+        if manifest.get(asset, {}).get("mtime") == mtime:
+            continue
+
+        entry = {"mtime": mtime, "variants": {}}
+        with Image.open(source_path) as image:
+            image.load()
+            for width in VARIANT_WIDTHS[group]:
+                width = min(width, image.width)
+                height = round(image.height * width / image.width)
+                resized = image.resize((width, height), Image.LANCZOS)
+
+                for extension, mimetype, options in formats:
+                    buffer = io.BytesIO()
+                    resized.save(buffer, format=extension.upper(), **options)
+                    content = buffer.getvalue()
+
+                    digest = hashlib.sha256(content).hexdigest()[:12]
+                    stem = os.path.splitext(asset)[0]
+                    file_name = f"{stem}-{width}.{digest}.{extension}"
+
+                    os.makedirs(os.path.dirname(os.path.join(IMAGES_DIR, file_name)), exist_ok=True)
+                    with open(os.path.join(IMAGES_DIR, file_name), "wb") as file:
+                        file.write(content)
+
+                    entry["variants"].setdefault(mimetype, {})[str(width)] = file_name
+
+        manifest[asset] = entry
+
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+
+    load_manifest.cache_clear()
+    return manifest
+
+
+@functools.lru_cache(maxsize=None)
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def register_routes(server):
+    @server.route(f"{ROUTE}/<path:file_name>")
+    def serve_image(file_name):
+        # file names carry a content hash, so a response never goes stale
+        response = send_from_directory(IMAGES_DIR, file_name, max_age=MAX_AGE)
+        response.headers["Cache-Control"] = f"public, max-age={MAX_AGE}, immutable"
+        return response
+
+
+def _src_set(variants):
+    return ", ".join(f"{ROUTE}/{file_name} {width}w"
+                     for width, file_name in sorted(variants.items(), key=lambda item: int(item[0])))
+
+
+def responsive_image(asset, sizes, style=None, className=None):
+    # asset is the path under assets/, e.g. "photos/P000556.png" or "MAD.png";
+    # sizes is the displayed width, e.g. "(max-width: 700px) 30vw, 10vw"
+    entry = load_manifest().get(asset)
+    props = {key: value for key, value in (("style", style), ("className", className)) if value is not None}
+    img = html.Img(src=dash.get_asset_url(asset), **props)
+    if not entry:
+        return img
+
+    img.sizes = sizes
+    sources = [html.Source(type=mimetype, srcSet=_src_set(entry["variants"][mimetype]), sizes=sizes)
+               for _, mimetype, _ in FORMATS if mimetype in entry["variants"]]
+
+    return html.Picture(children=[*sources, img], style={"display": "contents"})
+
+
+if __name__ == "__main__":
+    built = build(force=os.environ.get("EUROLEAGUE_IMAGES_FORCE") == "1")
+    print(f"{len(built)} images in {MANIFEST_PATH}")
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# startup benchmark: imports every page module in a fresh interpreter (dash already loaded, as it is
+# when Dash registers the pages) and reports its import time against a per-page budget.
+# Run from the app directory: python -m utils.import_benchmark [--budget-ms 500]
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(APP_DIR, "pages")
+IMPORT_BUDGET_MS = float(os.environ.get("EUROLEAGUE_IMPORT_BUDGET_MS", "500"))
+
+_PROBE = """
+import importlib.util, json, sys, time
+import dash
+
+app = dash.Dash(__name__, use_pages=True, pages_folder="")
+name, path = sys.argv[1], sys.argv[2]
+before = set(sys.modules)
+
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location(name, path)
+module = importlib.util.module_from_spec(spec)
+sys.modules[name] = module
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - start
+
+print(json.dumps({"ms": 1000 * elapsed, "modules": len(set(sys.modules) - before)}))
+"""
+
+
+def page_modules():
+    for root, _, files in os.walk(PAGES_DIR):
+        for file_name in sorted(files):
+            if file_name.endswith(".py"):
+                path = os.path.join(root, file_name)
+                name = os.path.splitext(os.path.relpath(path, APP_DIR))[0].replace(os.sep, ".")
+                yield name, path
+
+
+def measure(name, path):
+    output = subprocess.run([sys.executable, "-c", _PROBE, name, path], cwd=APP_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'page module':<28}{'import ms':>12}{'new modules':>14}")
+    for name, path in sorted(page_modules()):
+        result = measure(name, path)
+        flag = "  over budget" if result["ms"] > args.budget_ms else ""
+        print(f"{name:<28}{result['ms']:>12.1f}{result['modules']:>14}{flag}")
+        if flag:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"{len(over_budget)} page(s) over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+
+from utils import api, store
+from utils.cache import MemoryCache, MISSING
+
+# the key stats table of a game (home | stat | away), built from the two GameLite records and memoized per game,
+# for good once the game is finished. The returned rows are shared between renders, never mutate them.
+
+KEY_STATS_CACHE_SIZE = int(os.environ.get("EUROLEAGUE_KEY_STATS_CACHE_SIZE", "256"))
+
+STAT_NAMES = ("2P%", "3P%", "FT%", "DREB%", "OREB%", "AS", "TO", "ST", "BL", "POS", "ORtg")
+COLUMNS = ("left_col", "mid_col", "right_col")
+
+_key_stats = MemoryCache(max_size=KEY_STATS_CACHE_SIZE)
+
+
+def team_column(record):
+    # one team's values, in the order of STAT_NAMES
+    return [f"{record['2FGM']} / {record['2FGA']} ({100 * record['2FGR']:.2f}%)",
+            f"{record['3FGM']} / {record['3FGA']} ({100 * record['3FGR']:.2f}%)",
+            f"{record['FTM']} / {record['FTA']} ({100 * record['FTR']:.2f}%)",
+            f"{record['D']}  ({100 * record['DRBEBR']:.2f}%)",
+            f"{record['O']}  ({100 * record['ORBEBR']:.2f}%)",
+            *(f"{record[stat]}" for stat in ("AS", "TO", "ST", "FV", "pos")),
+            f"{100 * record['PPP']:.2f}"]
+
+
+def key_stats_rows(df_teams):
+    # split the frame into its home and away records once
+    records = {bool(record["home"]): record for record in df_teams.to_dict("records")}
+
+    return tuple(dict(zip(COLUMNS, row))
+                 for row in zip(team_column(records[True]), STAT_NAMES, team_column(records[False])))
+
+
+def game_key_stats(game_code, teams_key):
+    # teams_key: store key of the game's GameLite frame, only loaded when the rows are not memoized yet
+    rows = _key_stats.get(str(game_code))
+    if rows is MISSING:
+        rows = key_stats_rows(store.frame(teams_key))
+        # a game that is still being played gets new rows once its GameLite frame expires
+        _key_stats.set(str(game_code), rows, ttl=None if api.game_finished(game_code) else api.SEASON_TTL)
+
+    return rows
+
+
+def invalidate(game_code):
+    _key_stats.delete(str(game_code))
@@ -0,0 +1,211 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils import api, assist_network, generations, key_stats, output_cache, paging, scheduler, store
+from utils.cache import MemoryCache, MISSING
+
+# page-level loaders that fan the upstream calls of a page out concurrently on the server.
+# Tasks running on the pool never submit to it themselves, a full pool would otherwise wait on itself.
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.environ.get("EUROLEAGUE_LOADER_WORKERS", "8"))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+_team_results = MemoryCache(max_size=64)
+
+
+def get_executor():
+    # thread pools do not survive a fork, build one per worker process
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="euroleague-loader")
+                _executor_pid = pid
+
+    return _executor
+
+
+def fetch_all(calls):
+    # calls: {name: (endpoint, params)} -> {name: response}
+    futures = {name: get_executor().submit(api.get, endpoint, **params)
+               for name, (endpoint, params) in calls.items()}
+
+    return {name: future.result() for name, future in futures.items()}
+
+
+def put_all(calls):
+    # like fetch_all, but the frames stay in the server-side store and only their keys are returned
+    futures = {name: get_executor().submit(store.put, endpoint, **params)
+               for name, (endpoint, params) in calls.items()}
+
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _game_calls(game_code):
+    # the URL gives "5", the admin route 5: one spelling, so every cache (paging keys on the repr) agrees
+    game_code = str(game_code)
+    return {
+        "players": ("GamePlayers", {"game_code": game_code}),
+        "teams": ("GameLite", {"game_code": game_code}),
+        "points": ("PointsSingleGame", {"game_code": game_code}),
+        "assists": ("AssistsSingleGame", {"game_code": game_code}),
+    }
+
+
+def load_game_bundle(game_code):
+    return put_all(_game_calls(game_code))
+
+
+def game_bundle_keys(game_code):
+    # the same keys as load_game_bundle, without loading anything
+    return {name: store.make_key(endpoint, **params) for name, (endpoint, params) in _game_calls(game_code).items()}
+
+
+def _drop_game(game_code):
+    # everything this worker caches for a game, from the API responses to the rendered sections
+    bundle = game_bundle_keys(game_code)
+    for key in bundle.values():
+        api.invalidate(key["endpoint"], **key["params"])
+        store.invalidate(key)
+
+    paging.invalidate("box-score", bundle["players"])
+
+    key_stats.invalidate(game_code)
+    assist_network.invalidate(game_code)
+    output_cache.invalidate_game(game_code)
+
+
+def invalidate_game(game_code):
+    # here right away, in the other workers through the game's generation (see sync_game)
+    _drop_game(game_code)
+    generations.bump(f"game/{game_code}")
+
+
+def sync_game(game_code):
+    # call before serving a game from the caches: drops this worker's copies once another one invalidated it
+    if generations.outdated(f"game/{game_code}"):
+        _drop_game(game_code)
+
+
+def load_team_results(team_code):
+    # a team's whole season of results, indexed for joins against player game logs
+    results = _team_results.get(team_code)
+    if results is not MISSING:
+        return results
+
+    results = api.fetch_frame("Game", team=team_code)
+    if results.empty:
+        # no games yet, the JSON answer is [] and has no columns at all
+        results = pd.DataFrame(columns=["game_code", "points_scored", "opp_points_scored"])
+
+    results = results.loc[:, ["game_code", "points_scored", "opp_points_scored"]] \
+        .drop_duplicates("game_code") \
+        .assign(CODETEAM=team_code) \
+        .set_index(["CODETEAM", "game_code"])
+
+    _team_results.set(team_code, results, ttl=api.SEASON_TTL)
+    return results
+
+
+def latest_games():
+    # {team_code: game_code of the team's last game}, from the cached team results
+    team_codes = [team["CODETEAM"] for team in api.get("SeasonTeams")]
+    results = get_executor().map(load_team_results, team_codes)
+
+    return {team_code: int(df.index.get_level_values("game_code").max())
+            for team_code, df in zip(team_codes, results) if not df.empty}
+
+
+def refresh_finished_games():
+    # a game is over once every team has played after it; until then its responses expire with SEASON_TTL
+    latest = latest_games()
+    if latest:
+        api.set_finished_before(min(latest.values()))
+
+
+def _refresh_finished_games_once():
+    try:
+        refresh_finished_games()
+    except Exception:
+        logger.exception("could not look up the finished games")
+
+
+def track_finished_games():
+    # call once per process (gunicorn post_fork, or the dev server), like warmer.start
+    scheduler.every("finished-games", api.SEASON_TTL, refresh_finished_games)
+    threading.Thread(target=_refresh_finished_games_once, name="euroleague-finished-games", daemon=True).start()
+
+
+def _team_codes(df_history):
+    if "CODETEAM" not in df_history:
+        return []
+    return df_history["CODETEAM"].unique().tolist()
+
+
+def load_player_history(player_id):
+    # call from a request thread, not from a pool task
+    df_history = store.frame(store.make_key("GamePlayers", player_id=player_id))
+
+    team_codes = _team_codes(df_history)
+    results = list(get_executor().map(load_team_results, team_codes))
+    if results:
+        results = pd.concat(results)
+    else:
+        results = pd.DataFrame(columns=["points_scored", "opp_points_scored"],
+                               index=pd.MultiIndex.from_arrays([[], []], names=["CODETEAM", "game_code"]))
+
+    return df_history.join(results, on=["CODETEAM", "game_code"])
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def load_player_bundle(player_id):
+    # every upstream call of a player page at once; the frames stay in the store, the bundle holds their
+    # keys and the wall time of each sub-request in ms
+    executor = get_executor()
+    start = time.perf_counter()
+
+    calls = {
+        "history": ("GamePlayers", {"player_id": player_id}),
+        "player": ("Player", {"player_id": player_id}),
+        "points": ("PointsPlayer", {"player_id": player_id}),
+        "source": ("AssistsPlayer", {"assisting_player": player_id}),
+        "target": ("AssistsPlayer", {"player_id": player_id}),
+    }
+    futures = {name: executor.submit(_timed, store.put, endpoint, **params)
+               for name, (endpoint, params) in calls.items()}
+
+    bundle, timings = {}, {}
+    bundle["history"], timings["history"] = futures.pop("history").result()
+
+    # the results of the player's teams hang off the game log, queued from here while the rest still runs
+    team_codes = _team_codes(store.frame(bundle["history"]))
+    futures.update({f"results:{team_code}": executor.submit(_timed, load_team_results, team_code)
+                    for team_code in team_codes})
+
+    for name, future in futures.items():
+        result, timings[name] = future.result()
+        if not name.startswith("results:"):
+            bundle[name] = result
+
+    bundle["timings"] = {name: round(1000 * elapsed, 1) for name, elapsed in timings.items()}
+    bundle["timings"]["total"] = round(1000 * (time.perf_counter() - start), 1)
+    logger.info("player bundle %s loaded in %s", player_id, bundle["timings"])
+
+    return bundle
@@ -0,0 +1,51 @@
+import json
+import os
+
+from plotly.io.json import to_json_plotly
+
+from utils import api
+from utils.cache import CACHE_BACKEND, MISSING, make_cache
+
+# rendered game page sections (components, figures, table pages) as serialized JSON, keyed by game_code.
+# A hit is a json.loads away from being sent to the browser, no pandas or plotly involved. The memory backend
+# is per worker, "disk" is shared by all workers on the host (EUROLEAGUE_CACHE_DIR, /dev/shm for shared memory).
+# Invalidations reach the other workers either way, see loaders.sync_game.
+
+OUTPUT_CACHE_BACKEND = os.environ.get("EUROLEAGUE_OUTPUT_CACHE_BACKEND", CACHE_BACKEND)
+OUTPUT_CACHE_SIZE = int(os.environ.get("EUROLEAGUE_OUTPUT_CACHE_SIZE", "1024"))
+# finished games never change and are kept until evicted, pages of games that are still being played expire
+OUTPUT_TTL = float(os.environ.get("EUROLEAGUE_OUTPUT_TTL", str(api.SEASON_TTL)))
+
+GAME_SECTIONS = ("score-title", "key-stats", "box-score", "assist-charts")
+
+_outputs = make_cache("output", backend=OUTPUT_CACHE_BACKEND, max_size=OUTPUT_CACHE_SIZE)
+
+
+def _key(game_code, section):
+    return f"game/{game_code}/{section}"
+
+
+def get_game(game_code):
+    # {section: output} of the cached sections of a game
+    sections = {}
+    for section in GAME_SECTIONS:
+        serialized = _outputs.get(_key(game_code, section))
+        if serialized is not MISSING:
+            sections[section] = json.loads(serialized)
+
+    return sections
+
+
+def put(game_code, section, output):
+    ttl = None if api.game_finished(game_code) else OUTPUT_TTL
+    _outputs.set(_key(game_code, section), to_json_plotly(output), ttl=ttl)
+    return output
+
+
+def invalidate_game(game_code, sections=GAME_SECTIONS):
+    for section in sections:
+        _outputs.delete(_key(game_code, section))
+
+
+def clear():
+    _outputs.clear()
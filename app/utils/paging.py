@@ -0,0 +1,150 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils import api
+from utils.cache import MemoryCache, MISSING
+
+# backend paging, sorting and filtering for DataTables with page_action/sort_action/filter_action="custom".
+# Pages prepare the display frame once (cached here), every table interaction only slices and serialises
+# the visible rows. Formatted or markdown columns can carry their raw values in value_column(name),
+# sorting and filtering then use those instead of the display strings; sort_column(name) overrides the
+# sort order alone.
+
+PAGE_SIZE = int(os.environ.get("EUROLEAGUE_TABLE_PAGE_SIZE", "25"))
+TABLE_CACHE_SIZE = int(os.environ.get("EUROLEAGUE_TABLE_CACHE_SIZE", "256"))
+VALUE_PREFIX = "_value_"
+SORT_PREFIX = "_sort_"
+
+# as in the DataTable filter syntax, longest operators first
+OPERATORS = (("ge ", ">="), ("le ", "<="), ("lt ", "<"), ("gt ", ">"), ("ne ", "!="), ("eq ", "="),
+             ("contains ",), ("datestartswith ",))
+
+_tables = MemoryCache(max_size=TABLE_CACHE_SIZE)
+
+
+def value_column(name):
+    # formatted columns sort and filter on the values behind them, in the unit the table shows
+    # (e.g. minutes for "12:34"), so that {MIN} > 20 means what it reads
+    return f"{VALUE_PREFIX}{name}"
+
+
+def sort_column(name):
+    # when a column filters on one value but sorts on another (a link text ordered by date)
+    return f"{SORT_PREFIX}{name}"
+
+
+def prepared(name, token, build, ttl=api.SEASON_TTL):
+    # the display frame of table `name` for `token` (e.g. a store key), built once
+    key = (name, repr(token))
+    df = _tables.get(key)
+    if df is MISSING:
+        df = build()
+        _tables.set(key, df, ttl=ttl)
+
+    return df
+
+
+def invalidate(name, token):
+    _tables.delete((name, repr(token)))
+
+
+def split_filter_part(filter_part):
+    for operator_type in OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find("{") + 1: name_part.rfind("}")]
+
+                value_part = value_part.strip()
+                quote = value_part[:1]
+                if quote and quote == value_part[-1] and quote in ("'", '"', "`"):
+                    value = value_part[1:-1].replace("\\" + quote, quote)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+
+                return name, operator_type[0].strip(), value
+
+    return None, None, None
+
+
+def parse_filter(filter_query):
+    # "{pts} > 10 && {Name} contains lessort" -> [("pts", "gt", 10.0), ("Name", "contains", "lessort")]
+    parts = (split_filter_part(part) for part in (filter_query or "").split(" && ") if part.strip())
+    return [part for part in parts if part[0] is not None]
+
+
+def _values(df, column):
+    source = value_column(column)
+    return df[source] if source in df else df[column]
+
+
+def _sort_values(df, column):
+    source = sort_column(column)
+    return df[source] if source in df else _values(df, column)
+
+
+def _text(value):
+    # "5" arrives parsed as 5.0
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def filter_frame(df, filter_query):
+    mask = np.ones(len(df), dtype=bool)
+    for column, operator, value in parse_filter(filter_query):
+        if column not in df:
+            continue
+
+        values = _values(df, column)
+        if operator == "contains":
+            matched = values.astype(str).str.contains(_text(value), case=False, regex=False)
+        elif operator == "datestartswith":
+            matched = values.astype(str).str.startswith(_text(value))
+        else:
+            if isinstance(value, float):
+                values = pd.to_numeric(values, errors="coerce")
+            matched = {"eq": values == value, "ne": values != value,
+                       "lt": values < value, "le": values <= value,
+                       "gt": values > value, "ge": values >= value}[operator]
+
+        mask &= matched.fillna(False).to_numpy(dtype=bool)
+
+    return df.loc[mask]
+
+
+def sort_frame(df, sort_by):
+    sort_by = [item for item in (sort_by or []) if item["column_id"] in df]
+    if not sort_by:
+        return df
+
+    keys = pd.DataFrame({i: _sort_values(df, item["column_id"]).to_numpy() for i, item in enumerate(sort_by)})
+    order = keys.sort_values(list(keys.columns),
+                             ascending=[item["direction"] == "asc" for item in sort_by],
+                             na_position="last", kind="stable").index
+
+    return df.iloc[order]
+
+
+def page(df, page_current=0, page_size=PAGE_SIZE, sort_by=None, filter_query=None, columns=None):
+    # -> (records of the visible page, page_count)
+    df = sort_frame(filter_frame(df, filter_query), sort_by)
+
+    page_size = page_size or PAGE_SIZE
+    page_count = max(1, math.ceil(len(df) / page_size))
+    page_current = min(page_current or 0, page_count - 1)
+
+    visible = df.iloc[page_current * page_size:(page_current + 1) * page_size]
+    if columns is not None:
+        visible = visible.loc[:, list(columns)]
+    else:
+        visible = visible.loc[:, [column for column in df.columns
+                                  if not column.startswith((VALUE_PREFIX, SORT_PREFIX))]]
+
+    return visible.to_dict("records"), page_count
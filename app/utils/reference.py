@@ -0,0 +1,49 @@
+import logging
+import os
+import threading
+
+from utils import api, scheduler, table_specs
+
+# league-wide quantile tables, loaded once per process and refreshed in the background
+
+logger = logging.getLogger(__name__)
+
+QUANTILE_TYPES = ("player", "player_agg")
+REFRESH_INTERVAL = float(os.environ.get("EUROLEAGUE_REFERENCE_REFRESH", str(60 * 60)))
+
+_quantiles = {}
+_rules = {}
+_lock = threading.Lock()
+
+
+def refresh(type_quantile=None):
+    for quantile_type in ([type_quantile] if type_quantile else QUANTILE_TYPES):
+        try:
+            quantiles = api.fetch("Quantile", type_quantile=quantile_type)[0]["quantiles"]
+        except Exception:
+            # keep serving the previous tables if the upstream is unavailable
+            logger.exception("could not refresh %s quantiles", quantile_type)
+            if quantile_type not in _quantiles:
+                raise
+            continue
+
+        rules = table_specs.pir_rules(tuple(quantiles))
+        with _lock:
+            _quantiles[quantile_type] = quantiles
+            _rules[quantile_type] = rules
+
+
+def _ensure_loaded(type_quantile):
+    scheduler.every("reference-refresh", REFRESH_INTERVAL, refresh)
+    if type_quantile not in _quantiles:
+        refresh(type_quantile)
+
+
+def quantiles(type_quantile):
+    _ensure_loaded(type_quantile)
+    return _quantiles[type_quantile]
+
+
+def pir_rules(type_quantile):
+    _ensure_loaded(type_quantile)
+    return _rules[type_quantile]
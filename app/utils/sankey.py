@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.cache import MemoryCache, MISSING
+
+# player assist flows: assisting player -> scorer -> play type, for the passes a player made ("source")
+# and the ones they received ("target"). Both frames go through one groupby; labels are factorized.
+
+COLUMNS = ["playerNameAssisting", "playerName", "PLAYTYPE"]
+SIDES = ("source", "target")
+COLORS = {"source": ("#F6BD60", "#84A59D"),
+          "target": ("#F7EDE2", "#F28482")}
+SANKEY_CACHE_SIZE = int(os.environ.get("EUROLEAGUE_SANKEY_CACHE_SIZE", "256"))
+
+_figures = MemoryCache(max_size=SANKEY_CACHE_SIZE)
+
+
+def sankey_links(df_source, df_target):
+    # -> {side: (labels, source codes, target codes, values)}
+    frames = pd.concat({side: df.reindex(columns=COLUMNS) for side, df in zip(SIDES, (df_source, df_target))},
+                       names=["side", None]).reset_index(level="side")
+
+    left = frames.groupby(["side", "playerNameAssisting", "playerName"]).size()
+    right = frames.groupby(["side", "playerName", "PLAYTYPE"]).size()
+
+    links = {}
+    for side in SIDES:
+        side_left = left.xs(side, level="side") if side in left.index else left.iloc[:0].droplevel("side")
+        side_right = right.xs(side, level="side") if side in right.index else right.iloc[:0].droplevel("side")
+
+        starts = np.concatenate([side_left.index.get_level_values(0), side_right.index.get_level_values(0)])
+        ends = np.concatenate([side_left.index.get_level_values(1), side_right.index.get_level_values(1)])
+        values = np.concatenate([side_left.to_numpy(), side_right.to_numpy()])
+
+        codes, labels = pd.factorize(np.concatenate([starts, ends]))
+        source, target = codes[:len(starts)], codes[len(starts):]
+
+        # links with the same label on both ends would loop back on a node
+        keep = source != target
+        links[side] = (labels, source[keep], target[keep], values[keep])
+
+    return links
+
+
+def sankey_figure(labels, source, target, values, node_color, link_color):
+    return go.Figure(data=[go.Sankey(
+        node=dict(
+            pad=15,
+            thickness=20,
+            line=dict(width=0.5),
+            label=labels,
+            color=node_color
+        ),
+        link=dict(
+            source=source,
+            target=target,
+            value=values,
+            color=link_color
+        ))])
+
+
+def player_sankeys(player_id, df_source, df_target):
+    # new games only ever add assists, so the row counts are enough to notice fresh data
+    key = (player_id, len(df_source), len(df_target))
+    figures = _figures.get(key)
+    if figures is not MISSING:
+        return figures
+
+    links = sankey_links(df_source, df_target)
+    figures = tuple(sankey_figure(*links[side], *COLORS[side]) for side in SIDES)
+
+    _figures.set(key, figures)
+    return figures
@@ -0,0 +1,41 @@
+import logging
+import os
+import threading
+
+# periodic background jobs; threads do not survive a fork so every worker process starts its own
+
+logger = logging.getLogger(__name__)
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def _run(name, interval, func, stop):
+    while not stop.wait(interval):
+        try:
+            func()
+        except Exception:
+            logger.exception("background job %s failed", name)
+
+
+def every(name, interval, func):
+    pid = os.getpid()
+    with _jobs_lock:
+        job = _jobs.get(name)
+        if job is not None and job["pid"] == pid and job["thread"].is_alive():
+            return job
+
+        stop = threading.Event()
+        thread = threading.Thread(target=_run, args=(name, interval, func, stop), name=f"euroleague-{name}",
+                                  daemon=True)
+        thread.start()
+        job = _jobs[name] = {"pid": pid, "thread": thread, "stop": stop}
+
+    return job
+
+
+def cancel(name):
+    with _jobs_lock:
+        job = _jobs.pop(name, None)
+    if job is not None:
+        job["stop"].set()
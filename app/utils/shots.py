@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import sequential
+
+from utils import court
+
+# shot charts: the density grid is binned on the server and shipped as a compact go.Contour,
+# raw shot markers are optional and down-sampled above MAX_MARKERS
+
+DENSITY_BINS = int(os.environ.get("EUROLEAGUE_SHOT_BINS", "30"))
+MAX_MARKERS = int(os.environ.get("EUROLEAGUE_SHOT_MAX_MARKERS", "1000"))
+
+
+def colorscale(sequence):
+    return ['rgb(255, 255, 255)'] + sequence[1:][::-1]
+
+
+def density_grid(x, y, nbins=DENSITY_BINS):
+    # same binning as Histogram2dContour: nbins per axis over the extent of the data
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # like the client-side histogram, shots without a position are skipped
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=nbins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+
+    # histogram2d is indexed [x, y], plotly expects z rows along y
+    return x_centers, y_centers, counts.T
+
+
+def density_trace(x, y, scale, nbins=DENSITY_BINS):
+    x_centers, y_centers, z = density_grid(x, y, nbins)
+
+    return go.Contour(x=x_centers,
+                      y=y_centers,
+                      z=z,
+                      colorscale=scale,
+                      showscale=False,
+                      line=dict(width=0),
+                      hoverinfo='none',
+                      xaxis="x",
+                      yaxis="y")
+
+
+def marker_trace(df, size, opacity=None, max_markers=MAX_MARKERS):
+    if max_markers is not None and len(df) > max_markers:
+        df = df.sample(n=max_markers, random_state=0)
+
+    return go.Scatter(x=df["COORD_X"].to_numpy(),
+                      y=df["COORD_Y"].to_numpy(),
+                      opacity=opacity,
+                      mode='markers',
+                      marker=dict(
+                          symbol=np.where(df["missed"].to_numpy(dtype=bool), "x", "circle-open"),
+                          color='black',
+                          size=size,
+                      ),
+                      xaxis="x",
+                      yaxis="y",
+                      hoverinfo='none',
+                      customdata=np.stack((df['PLAYER'], df['ID_ACTION']), axis=-1),
+                      hovertemplate="<b>Player</b> %{customdata[0]} <br>" +
+                                    "<b>Shot Type</b> %{customdata[1]}")
+
+
+def shot_chart(df, sequence=sequential.Magma, nbins=DENSITY_BINS, marker_size=7, opacity=None,
+               show_markers=True, max_markers=MAX_MARKERS):
+    fig = court.court_figure()
+    if not df.empty:
+        # shots without a position would break the binning and can't be drawn
+        df = df.loc[np.isfinite(df["COORD_X"].to_numpy(dtype=np.float64))
+                    & np.isfinite(df["COORD_Y"].to_numpy(dtype=np.float64))]
+    if df.empty:
+        return fig
+
+    fig.add_trace(density_trace(df["COORD_X"], df["COORD_Y"], colorscale(sequence), nbins))
+
+    if show_markers:
+        fig.add_trace(marker_trace(df, marker_size, opacity, max_markers))
+
+    return fig
@@ -0,0 +1,56 @@
+import os
+
+from utils import api
+from utils.cache import CACHE_BACKEND, MISSING, make_cache
+
+# server-side data store: dcc.Store components only carry a small key {"endpoint": ..., "params": ...},
+# callbacks turn the key back into a ready DataFrame from this cache. A key that was evicted (or that
+# lands on a worker without the entry) is simply fetched again.
+
+FRAME_CACHE_BACKEND = os.environ.get("EUROLEAGUE_FRAME_CACHE_BACKEND", CACHE_BACKEND)
+FRAME_CACHE_SIZE = int(os.environ.get("EUROLEAGUE_FRAME_CACHE_SIZE", "512"))
+
+_frames = make_cache("frames", backend=FRAME_CACHE_BACKEND, max_size=FRAME_CACHE_SIZE)
+
+
+def make_key(endpoint, **params):
+    return {"endpoint": endpoint, "params": params}
+
+
+def _cache_key(key):
+    return api.cache_key(key["endpoint"], key["params"])
+
+
+def _load(key):
+    endpoint, params = key["endpoint"], key["params"]
+    df = api.fetch_frame(endpoint, **params)
+
+    cacheable, ttl = api.cache_ttl(endpoint, params)
+    if not cacheable:
+        ttl = api.SEASON_TTL
+    if ttl is None and df.empty:
+        ttl = api.SEASON_TTL
+
+    _frames.set(_cache_key(key), df, ttl=ttl)
+    return df
+
+
+def put(endpoint, **params):
+    key = make_key(endpoint, **params)
+    if _frames.get(_cache_key(key)) is MISSING:
+        _load(key)
+
+    return key
+
+
+def frame(key):
+    df = _frames.get(_cache_key(key))
+    if df is MISSING:
+        df = _load(key)
+
+    # callers add columns in place, never hand out the cached frame itself
+    return df.copy()
+
+
+def invalidate(key):
+    _frames.delete(_cache_key(key))
@@ -0,0 +1,57 @@
+import functools
+
+# DataTable column and style specs, built once per schema and shared between renders.
+# The returned tuples are shared: never mutate them or the dicts inside.
+
+TIER_COLORS = ("#9d9d9d", "#1eff00", "#0070dd", "#a335ee", "#ff8000")
+RANK_BOUNDS = (25, 50, 75, 95, 100)
+
+KEY_STATS_RULES = (
+    {"if": {"column_id": "left_col"},
+     "textAlign": "right"},
+    {"if": {"column_id": "mid_col"},
+     "textAlign": "center",
+     "font-weight": "bold"},
+    {"if": {"column_id": "right_col"},
+     "textAlign": "left"}
+)
+
+
+@functools.lru_cache(maxsize=256)
+def columns(names, markdown=()):
+    return tuple({"name": name, "id": name, "presentation": "markdown"} if name in markdown
+                 else {"name": name, "id": name}
+                 for name in names)
+
+
+def _tier_rules(column, bounds):
+    rules = [{"if": {"column_id": column,
+                     "filter_query": "{" + column + "} <= " + f"{bounds[0]}"},
+              "color": TIER_COLORS[0]}]
+
+    for lower, upper, color in zip(bounds[:4], bounds[1:5], TIER_COLORS[1:]):
+        rules.append({"if": {"column_id": column,
+                             "filter_query": "{" + column + "} > " + f"{lower}" + " && {" + column + "} <= " +
+                                             f"{upper}"},
+                      "color": color})
+
+    return rules
+
+
+@functools.lru_cache(maxsize=32)
+def pir_rules(quantiles):
+    return (
+        {"if": {"column_id": "pts"},
+         "font-weight": "bold",
+         "text-align": "center"},
+        {"if": {"column_id": "Name"},
+         "verticalAlign": "middle"},
+        {"if": {"column_id": "PIR"},
+         "font-weight": "bold"},
+        *_tier_rules("PIR", quantiles)
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def rank_rules(names, bounds=RANK_BOUNDS):
+    return tuple(rule for name in names for rule in _tier_rules(name, bounds))
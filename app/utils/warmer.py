@@ -0,0 +1,148 @@
+import contextlib
+import fcntl
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import directory, loaders, output_cache, scheduler, store
+from utils.cache import CACHE_BACKEND, CACHE_DIR
+
+# background warm-up: after a round, prefetch and prerender the new games and the teams and players in them,
+# so the first visitors get warm pages. Pages register a renderer per kind ("game", "team", "player").
+# Every worker warms its own process caches; a new worker (also one recycled after max_requests) warms right away.
+# At most WARM_PROCESSES passes run at once on the host (file lock slots), so the upstream sees at most
+# WARM_PROCESSES * WARM_WORKERS warm-up calls at a time. When the API, frame and output caches are on disk the
+# passes always take turns: the first one fetches and renders, the others mostly read from the shared caches.
+
+logger = logging.getLogger(__name__)
+
+WARM_INTERVAL = float(os.environ.get("EUROLEAGUE_WARM_INTERVAL", str(15 * 60)))
+WARM_WORKERS = int(os.environ.get("EUROLEAGUE_WARM_WORKERS", "4"))
+WARM_PROCESSES = int(os.environ.get("EUROLEAGUE_WARM_PROCESSES", "1"))
+SHARED_CACHES = CACHE_BACKEND == store.FRAME_CACHE_BACKEND == output_cache.OUTPUT_CACHE_BACKEND == "disk"
+SLOTS = 1 if SHARED_CACHES else max(1, WARM_PROCESSES)
+
+_renderers = {}
+
+# games this process has warmed, with their teams and players
+_warmed = set()
+
+
+def register(kind, render):
+    # render(entity_id) fetches and prerenders one game / team / player
+    _renderers[kind] = render
+
+
+@contextlib.contextmanager
+def _slot():
+    # blocks until one of the SLOTS lock files is free
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    while True:
+        for slot in range(SLOTS):
+            file = open(os.path.join(CACHE_DIR, f"warmer-{slot}.lock"), "a")
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | (fcntl.LOCK_NB if SLOTS > 1 else 0))
+            except BlockingIOError:
+                file.close()
+                continue
+
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+                file.close()
+            return
+
+        time.sleep(1)
+
+
+def latest_games():
+    # the last game of every team, i.e. the latest round, from the cached team results
+    return {str(game_code) for game_code in loaders.latest_games().values()}
+
+
+def game_entities(game_code):
+    df = store.frame(store.make_key("GamePlayers", game_code=game_code))
+    if df.empty:
+        return set(), set()
+
+    return set(df["CODETEAM"]), set(df["PLAYER_ID"])
+
+
+def _render(kind, entity_id):
+    start = time.perf_counter()
+    try:
+        _renderers[kind](entity_id)
+    except Exception:
+        logger.exception("could not prerender %s %s", kind, entity_id)
+        return False
+
+    logger.debug("prerendered %s %s in %.0f ms", kind, entity_id, 1000 * (time.perf_counter() - start))
+    return True
+
+
+def warm(kind, entity_ids, executor):
+    # -> the ids that were prerendered (all of them when no page renders this kind)
+    entity_ids = sorted(entity_ids)
+    if kind not in _renderers:
+        return set(entity_ids)
+
+    rendered = executor.map(lambda entity_id: _render(kind, entity_id), entity_ids)
+    return {entity_id for entity_id, ok in zip(entity_ids, rendered) if ok}
+
+
+def _entities(game_code):
+    try:
+        return game_entities(game_code)
+    except Exception:
+        logger.exception("could not list the teams and players of game %s", game_code)
+        return None
+
+
+def run():
+    games = latest_games() - _warmed
+    if not games:
+        return
+
+    with _slot():
+        start = time.perf_counter()
+        # a pool of its own: the renderers fan out on the loaders pool, which must never wait on itself
+        with ThreadPoolExecutor(max_workers=WARM_WORKERS, thread_name_prefix="euroleague-warmer") as executor:
+            warmed_games = warm("game", games, executor)
+            entities = {game_code: _entities(game_code) for game_code in warmed_games}
+            entities = {game_code: found for game_code, found in entities.items() if found is not None}
+
+            teams = set().union(*(game_teams for game_teams, _ in entities.values()))
+            # InitPlayer lists the players with a page
+            players = {player_id for _, game_players in entities.values() for player_id in game_players
+                       if directory.name(player_id) is not None}
+
+            warmed_teams = warm("team", teams, executor)
+            warmed_players = warm("player", players, executor)
+
+    # a game that failed anywhere is tried again on the next pass
+    failed = (teams - warmed_teams) | (players - warmed_players)
+    done = {game_code for game_code, (game_teams, game_players) in entities.items()
+            if not (game_teams | game_players) & failed}
+    _warmed.update(done)
+
+    logger.info("warmed %d/%d games, %d/%d teams and %d/%d players in %.1f s", len(done), len(games),
+                len(warmed_teams), len(teams), len(warmed_players), len(players), time.perf_counter() - start)
+
+
+def _run_once():
+    try:
+        run()
+    except Exception:
+        logger.exception("warm-up pass failed")
+
+
+def start():
+    # call once per process (gunicorn post_fork, or the dev server): a first pass now, then every WARM_INTERVAL
+    if WARM_INTERVAL <= 0:
+        return
+
+    scheduler.every("warmer", WARM_INTERVAL, run)
+    threading.Thread(target=_run_once, name="euroleague-warmer-initial", daemon=True).start()